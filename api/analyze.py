@@ -14,15 +14,634 @@ Designed to run in a containerized environment (Cloudflare Workers + Python).
 import os
 import re
 import json
-from pathlib import Path
+import bisect
+import codecs
+import configparser
+import datetime
+import fnmatch
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import functools
+import mmap
 import tempfile
 import subprocess
+import tomllib
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from scoring import CheckResult, ReproducibilityScorer
 
 
+_NEWLINE_RE = re.compile(b'\n')
+
+# requirements.txt: lines that name a requirement, and those pinned with ==
+_REQ_LINE_RE = re.compile(rb'(?m)^[ \t]*[A-Za-z0-9]')
+_REQ_PINNED_RE = re.compile(
+    rb'(?m)^[ \t]*[A-Za-z0-9][A-Za-z0-9_.\-]*(?:\[[^\]\n]*\])?[ \t]*=='
+)
+
+# A PEP 508 requirement string pinned with ==
+_PEP508_PINNED_RE = re.compile(r'^\s*[A-Za-z0-9][A-Za-z0-9_.\-]*(?:\[[^\]]*\])?\s*==')
+
+# A Poetry version constraint that names one exact version
+_POETRY_EXACT_RE = re.compile(r'^\s*(?:==?)?\s*\d[\w.+!-]*\s*$')
+
+# environment.yml: the top-level dependencies key and the list items under it
+_CONDA_DEPS_KEY_RE = re.compile(r'^dependencies\s*:\s*(?:#.*)?$')
+_CONDA_ITEM_RE = re.compile(r'^(\s*)-\s+(.*?)\s*(?:\s#.*)?$')
+# Item values YAML may read as something other than a plain string: a
+# mapping ("name: x"), a nested list, a directive or reserved indicator,
+# or a bool/null/number/timestamp scalar
+_CONDA_NOT_STRING_RE = re.compile(
+    r'.*:\s|[-?%@`#\'"\[{&*!|>0-9+.]'
+    r'|(?i:true|false|yes|no|on|off|null|~)$'
+)
+
+# Numbered backreferences (\1) and conditionals ((?(1)...)) in a check
+# pattern; these refer to groups by position, which wrapping shifts
+_GROUP_REF_RE = re.compile(r'\\[1-9]|\(\?\(\d')
+
+# Mentions of a seed or of reproducibility in docs and code, for the
+# seed_documented check (which has no patterns in checks.json)
+_SEED_DOC_PATTERNS = (r'seed.*=.*\d+', r'random.*seed', r'reproducib')
+
+# `git ls-files --stage` entry, and the mode git uses for submodules
+_LS_FILES_STAGE_RE = re.compile(r'([0-7]{6}) [0-9a-f]+ [0-3]\t(.*)', re.DOTALL)
+_GITLINK_MODE = '160000'
+
+# Directories never descended into when indexing a repository: VCS data,
+# virtualenvs, caches and build output hold many files (often vendored .py
+# and .md) that say nothing about the project's reproducibility
+_EXCLUDE_DIRS = {
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__', 'build', 'dist',
+    '.tox', '.mypy_cache', '.pytest_cache', 'site-packages',
+}
+
+# Minimum bytes pending in one _search_code_patterns call before the scan
+# fans out to worker processes. Starting a fork-server pool costs about
+# 0.4 s, and the in-process scan runs at roughly 12-16 MB/s per core with
+# a plain alternation (faster with the Hyperscan prefilter), so sharding
+# only pays for itself on tens of megabytes of source
+_PARALLEL_SCAN_MIN_BYTES = 32 * 1024 * 1024
+
+# Files larger than this, empty files and known binary formats are never
+# pattern-scanned
+_MAX_SCAN_BYTES = 2 * 1024 * 1024
+
+# Files at least this large are memory-mapped instead of read into memory
+_MMAP_MIN_BYTES = 256 * 1024
+
+# Scans over at least this many files read them ahead on a thread pool
+_PREFETCH_MIN_FILES = 16
+_PREFETCH_WORKERS = 32
+_BINARY_SUFFIXES = {
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.pdf', '.zip', '.gz', '.tar',
+    '.whl', '.egg', '.so', '.dll', '.exe', '.pyc', '.npy', '.npz', '.h5',
+    '.pkl', '.pt', '.bin',
+}
+
+
+def _toml_table(value) -> Dict:
+    """value if it is a TOML table, else an empty one."""
+    return value if isinstance(value, dict) else {}
+
+
+def _toml_array(value) -> List:
+    """value if it is a TOML array, else an empty one."""
+    return value if isinstance(value, list) else []
+
+
+def _count_pyproject_pins(pyproject: Dict) -> tuple[int, int]:
+    """
+    Count pinned and total dependencies declared in a parsed pyproject.toml.
+    
+    Reads PEP 621 ``[project]`` dependencies (including optional ones) and
+    ``[tool.poetry]`` dependency tables, dependency groups included. Keys
+    holding the wrong kind of value are ignored rather than trusted, since
+    the file is user input.
+    """
+    pinned = 0
+    total = 0
+    
+    project = _toml_table(pyproject.get('project'))
+    requirements = list(_toml_array(project.get('dependencies')))
+    for group in _toml_table(project.get('optional-dependencies')).values():
+        requirements.extend(_toml_array(group))
+    
+    for requirement in requirements:
+        if isinstance(requirement, str):
+            total += 1
+            if _PEP508_PINNED_RE.match(requirement):
+                pinned += 1
+    
+    poetry = _toml_table(_toml_table(pyproject.get('tool')).get('poetry'))
+    sections = [poetry.get('dependencies'), poetry.get('dev-dependencies')]
+    # Poetry 1.2+ dependency groups: [tool.poetry.group.<name>.dependencies]
+    for group in _toml_table(poetry.get('group')).values():
+        sections.append(_toml_table(group).get('dependencies'))
+    
+    for section in sections:
+        for name, spec in _toml_table(section).items():
+            if name == 'python':
+                continue
+            if isinstance(spec, dict):
+                spec = spec.get('version', '')
+            total += 1
+            if isinstance(spec, str) and _POETRY_EXACT_RE.match(spec):
+                pinned += 1
+    
+    return pinned, total
+
+
+def _scan_conda_dependencies(content: str) -> Optional[List[str]]:
+    """
+    Extract the string dependencies of a block-style environment.yml.
+    
+    Nested entries such as ``- pip:`` and their children are skipped, the
+    same as a full YAML parse that keeps only string items. Returns None
+    whenever an item might not be a plain string (flow lists, quoting,
+    anchors, inline mappings, bools, numbers) or might continue on the
+    next line, so the caller can fall back to PyYAML.
+    """
+    lines = content.splitlines()
+    for start, line in enumerate(lines):
+        if _CONDA_DEPS_KEY_RE.match(line):
+            break
+    else:
+        return None if 'dependencies' in content else []
+    
+    deps = []
+    item_indent = None
+    nested = False
+    for line in lines[start + 1:]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        
+        match = _CONDA_ITEM_RE.match(line)
+        if match is None:
+            indent = len(line) - len(line.lstrip())
+            if indent == 0:
+                break  # next top-level key
+            if nested and indent > item_indent:
+                continue  # child of a nested entry
+            # Anything else continues the previous item's value
+            return None
+        
+        indent, value = len(match.group(1)), match.group(2)
+        if item_indent is None:
+            item_indent = indent
+        if indent > item_indent:
+            if nested:
+                continue  # child of a nested entry
+            return None
+        if indent < item_indent:
+            return None
+        nested = value.endswith(':')
+        if nested:
+            continue  # nested mapping, e.g. "- pip:"
+        if not value or _CONDA_NOT_STRING_RE.match(value):
+            # Empty or comment-only items may continue on the next line;
+            # leave those, and anything that isn't a plain string, to a
+            # real YAML parser
+            return None
+        deps.append(value)
+    
+    return deps
+
+
+def _git_ls_files(repo_path: str) -> Optional[Dict[str, bool]]:
+    """
+    List the files git knows about under repo_path.
+    
+    Covers tracked files plus untracked ones that aren't ignored, with paths
+    relative to repo_path, mapped to whether the entry is a submodule
+    (gitlink). Submodules are directories in the work tree, though a
+    shallow clone leaves them empty. Returns None if repo_path isn't the
+    root of a git work tree or git is unavailable.
+    """
+    # Only trust git for the root of a work tree. A directory nested inside
+    # another repository may be ignored by it, and ls-files would then
+    # report nothing at all
+    if not os.path.exists(os.path.join(repo_path, '.git')):
+        return None
+    
+    try:
+        result = subprocess.run(
+            ['git', '-C', repo_path, 'ls-files', '-z', '--stage',
+             '--cached', '--others', '--exclude-standard'],
+            capture_output=True
+        )
+    except Exception:
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    # Tracked entries read "<mode> <object> <stage>\t<path>"; untracked
+    # ones are listed as a bare path
+    entries = {}
+    for entry in os.fsdecode(result.stdout).split('\0'):
+        if not entry:
+            continue
+        match = _LS_FILES_STAGE_RE.match(entry)
+        if match is None:
+            entries.setdefault(entry, False)
+        else:
+            entries.setdefault(match.group(2), match.group(1) == _GITLINK_MODE)
+    return entries
+
+
+def _resolve_git_dir(repo_path: str) -> Optional[Path]:
+    """Locate the git directory of a work tree rooted at repo_path."""
+    dot_git = Path(repo_path) / '.git'
+    try:
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Worktrees and submodules: ".git" is a "gitdir: <path>" pointer
+            content = dot_git.read_text().strip()
+            if content.startswith('gitdir:'):
+                git_dir = Path(content[len('gitdir:'):].strip())
+                return git_dir if git_dir.is_absolute() else Path(repo_path) / git_dir
+    except OSError:
+        pass
+    return None
+
+
+def _git_common_dir(git_dir: Path) -> Path:
+    """Directory holding shared refs and config (differs for worktrees)."""
+    try:
+        common = (git_dir / 'commondir').read_text().strip()
+    except OSError:
+        return git_dir
+    common_dir = Path(common)
+    return common_dir if common_dir.is_absolute() else git_dir / common_dir
+
+
+def _read_head_commit(git_dir: Path, common_dir: Path) -> Optional[str]:
+    """Resolve HEAD to a commit hash from loose or packed refs."""
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return None
+    
+    if not head.startswith('ref:'):
+        return head  # detached HEAD
+    
+    ref = head[len('ref:'):].strip()
+    for base in (git_dir, common_dir):
+        try:
+            return (base / ref).read_text().strip()
+        except OSError:
+            continue
+    
+    try:
+        packed = (common_dir / 'packed-refs').read_text()
+    except OSError:
+        return None
+    for line in packed.splitlines():
+        sha, _, name = line.partition(' ')
+        if name == ref:
+            return sha
+    return None
+
+
+def _read_origin_url(common_dir: Path) -> Optional[str]:
+    """Read remote.origin.url from the git config file."""
+    try:
+        content = (common_dir / 'config').read_text()
+    except OSError:
+        return None
+    
+    # git indents keys with tabs, which configparser would read as
+    # continuation lines; repeated keys (e.g. fetch) are allowed
+    parser = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        parser.read_string('\n'.join(line.strip() for line in content.splitlines()))
+    except configparser.Error:
+        return None
+    return parser.get('remote "origin"', 'url', fallback='')
+
+
+def _available_cpus() -> int:
+    """
+    CPUs this process can actually use.
+    
+    Honours the scheduler affinity mask and a cgroup v2 CPU quota, either of
+    which can be far below os.cpu_count() in containers.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def _pending_scan_bytes(
+    repo_path: str, rel_paths: List[str], contents: Dict[str, bytes]
+) -> int:
+    """Total size of the files a scan would actually read."""
+    total = 0
+    for rel_path in rel_paths:
+        if rel_path in contents:
+            total += len(contents[rel_path])
+            continue
+        if _is_binary(rel_path):
+            continue
+        try:
+            size = os.stat(os.path.join(repo_path, rel_path)).st_size
+        except OSError:
+            continue
+        if size <= _MAX_SCAN_BYTES:
+            total += size
+    return total
+
+
+def _scan_mp_context():
+    """Multiprocessing context for parallel scans.
+    
+    The analyzer runs its checks on threads, and forking a threaded process
+    is unsafe, so prefer a fork server where the platform has one.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context()
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_alternation(patterns: tuple[str, ...]):
+    """
+    Compile a case-insensitive regex matching any of patterns.
+    
+    Each pattern is wrapped in a named group ``g<index>`` so the
+    originating pattern can be recovered from ``match.lastgroup``. The
+    regex is compiled as bytes, since files are scanned undecoded. Cached
+    per process, so analyzers created per request share the compiled form.
+    
+    Wrapping renumbers groups, so a pattern with a numbered backreference
+    or conditional would change meaning or fail to compile, and a group
+    named like a wrapper would collide. In those cases a tuple with one
+    compiled regex per pattern is returned instead; _scan_buffer accepts
+    either form.
+    """
+    if not any(_GROUP_REF_RE.search(p) for p in patterns):
+        source = '|'.join(f'(?P<g{i}>(?:{p}))' for i, p in enumerate(patterns))
+        try:
+            return re.compile(source.encode(), re.IGNORECASE)
+        except re.error:
+            pass
+    return tuple(re.compile(p.encode(), re.IGNORECASE) for p in patterns)
+
+
+@functools.lru_cache(maxsize=64)
+def _hyperscan_database(patterns: tuple[str, ...]):
+    """
+    Compile patterns into a Hyperscan prefilter database.
+    
+    Compiled in prefilter mode, so it may report files that the Python
+    regex would not match, but never misses one that it would. Returns None
+    when Hyperscan is not installed or rejects the patterns.
+    """
+    if hyperscan is None:
+        return None
+    
+    flag = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | \
+        hyperscan.HS_FLAG_PREFILTER
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[p.encode() for p in patterns],
+            ids=list(range(len(patterns))),
+            flags=[flag] * len(patterns)
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+def _hyperscan_hit(database, scratch, data: bytes) -> bool:
+    """Return True if any pattern in database matches data."""
+    hit = []
+    
+    def on_match(pattern_id, start, end, flags, context):
+        hit.append(pattern_id)
+        return True  # stop at the first match
+    
+    try:
+        database.scan(data, match_event_handler=on_match, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        pass
+    return bool(hit)
+
+
+def _scan_buffer(
+    content, rel_path: str, regex: re.Pattern, patterns: List[str],
+    database=None, scratch=None
+) -> List[Dict]:
+    """
+    Match a bytes-like file buffer; only the matched text is decoded.
+    
+    regex is what _compile_alternation returned: a single alternation, or
+    a tuple of per-pattern regexes whose matches are merged by position.
+    """
+    matches = []
+    if database is not None and not _hyperscan_hit(database, scratch, content):
+        return matches
+    newlines = None
+    
+    if isinstance(regex, tuple):
+        found = sorted(
+            ((index, match)
+             for index, single in enumerate(regex)
+             for match in single.finditer(content)),
+            key=lambda found_match: found_match[1].start()
+        )
+    else:
+        found = ((int(match.lastgroup[1:]), match) for match in regex.finditer(content))
+    
+    for index, match in found:
+        # Offsets of every newline, built once per file on
+        # the first hit so line lookups are O(log n)
+        if newlines is None:
+            newlines = [m.start() for m in _NEWLINE_RE.finditer(content)]
+        matches.append({
+            'file': rel_path,
+            'pattern': patterns[index],
+            'match': match.group().decode('utf-8', errors='replace'),
+            'line': bisect.bisect_left(newlines, match.start()) + 1
+        })
+    
+    return matches
+
+
+def _is_binary(path: str) -> bool:
+    """Whether path has a known binary file extension."""
+    return os.path.splitext(path)[1].lower() in _BINARY_SUFFIXES
+
+
+def _read_file(file_path: str) -> bytes:
+    """Read a whole file as bytes."""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def _read_small_file(file_path: str) -> Optional[bytes]:
+    """Bytes of a scannable file below the mmap threshold, else None."""
+    if _is_binary(file_path):
+        return None
+    try:
+        size = os.stat(file_path).st_size
+        if size == 0 or size >= _MMAP_MIN_BYTES:
+            return None
+        return _read_file(file_path)
+    except OSError:
+        return None
+
+
+# Reader threads shared by every scan in the process, so concurrent
+# analyses don't each start their own; (owning pid, executor)
+_prefetch_executor: Optional[tuple[int, ThreadPoolExecutor]] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """The process-wide prefetch pool, started on first use."""
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        # A forked worker inherits the parent's executor but not its threads
+        if _prefetch_executor is None or _prefetch_executor[0] != os.getpid():
+            _prefetch_executor = (
+                os.getpid(),
+                ThreadPoolExecutor(
+                    max_workers=_PREFETCH_WORKERS, thread_name_prefix='prefetch'
+                ),
+            )
+        return _prefetch_executor[1]
+
+
+def _prefetch_files(repo_path: str, rel_paths: List[str]) -> Dict[str, bytes]:
+    """
+    Read small files concurrently ahead of the regex scan.
+    
+    Overlaps the open/read/close of many small files instead of paying for
+    them one after another. Files that are skipped, too large to read
+    outright, or unreadable are left out of the result, as is everything
+    if no reader thread can be started; the caller then reads them itself.
+    """
+    if len(rel_paths) < _PREFETCH_MIN_FILES:
+        return {}
+    
+    try:
+        contents = list(_get_prefetch_executor().map(
+            _read_small_file, [os.path.join(repo_path, p) for p in rel_paths]
+        ))
+    except RuntimeError:
+        # Thread limit reached, or the interpreter is shutting down
+        return {}
+    return {
+        rel_path: content
+        for rel_path, content in zip(rel_paths, contents)
+        if content is not None
+    }
+
+
+def _scan_files(
+    repo_path: str, rel_paths: List[str], regex: re.Pattern, patterns: List[str],
+    contents: Optional[Dict[str, bytes]] = None
+) -> List[Dict]:
+    """
+    Scan files for matches of a pattern alternation.
+    
+    Module-level so it can run in a worker process.
+    
+    Args:
+        repo_path: Repository root
+        rel_paths: Files to scan, relative to repo_path
+        regex: Alternation built by _compile_alternation
+        patterns: Source patterns, indexed by the regex group names
+        contents: Optional cache of file bytes keyed by relative path; used
+            for files already read and filled with the ones read here
+        
+    Returns:
+        List of match dicts
+    """
+    matches = []
+    
+    # With Hyperscan available, a single DFA pass over the file rules out
+    # files with no possible match before Python's regex engine runs
+    database = _hyperscan_database(tuple(patterns))
+    scratch = hyperscan.Scratch(database) if database is not None else None
+    
+    if contents is None:
+        contents = {}
+    contents.update(_prefetch_files(
+        repo_path, [p for p in rel_paths if p not in contents]
+    ))
+    
+    for rel_path in rel_paths:
+        if rel_path in contents:
+            matches.extend(_scan_buffer(
+                contents[rel_path], rel_path, regex, patterns, database, scratch
+            ))
+            continue
+        
+        if _is_binary(rel_path):
+            continue
+        
+        # Plain string join; no Path object per file
+        file_path = os.path.join(repo_path, rel_path)
+        try:
+            size = os.stat(file_path).st_size
+            if size == 0 or size > _MAX_SCAN_BYTES:
+                continue
+            
+            # Large files are memory-mapped so pages are read lazily rather
+            # than copied into one bytes object; small files are cheaper to
+            # read outright
+            if size >= _MMAP_MIN_BYTES:
+                with open(file_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    matches.extend(_scan_buffer(
+                        content, rel_path, regex, patterns, database, scratch
+                    ))
+            else:
+                content = contents[rel_path] = _read_file(file_path)
+                matches.extend(_scan_buffer(
+                    content, rel_path, regex, patterns, database, scratch
+                ))
+        except Exception:
+            continue
+    
+    return matches
+
+
 @dataclass
 class AnalysisResult:
     """Complete analysis result for a repository."""
@@ -39,13 +658,38 @@ class AnalysisResult:
 class RepositoryAnalyzer:
     """Analyze a repository for reproducibility signals."""
     
-    def __init__(self, checks_config_path: str = "data/checks.json"):
-        """Initialize analyzer with check definitions."""
-        with open(checks_config_path, 'r') as f:
-            self.config = json.load(f)
+    def __init__(self, checks_config_path: str = "data/checks.json",
+                 scorer: Optional[ReproducibilityScorer] = None):
+        """
+        Initialize analyzer with check definitions.
         
+        Args:
+            checks_config_path: Path to checks configuration, used when no scorer is given
+            scorer: Scorer to reuse; a new one is loaded from the config if omitted
+        """
+        self.scorer = scorer or ReproducibilityScorer(checks_config_path)
+        
+        # Checks come from the scorer's config, so analysis and scoring
+        # always agree even if the file has changed since it was loaded
+        self.config = self.scorer.config
         self.checks = self.config['checks']
-        self.scorer = ReproducibilityScorer(checks_config_path)
+        
+        # Index of every file/directory in the repository, built by a single
+        # walk and shared by all the _find_* / _search_* helpers
+        self._index: Optional[Dict] = None
+        self._index_root: Optional[str] = None
+        
+        # Per-repository caches, reset whenever the index is rebuilt: bytes
+        # of files already read, and scan results keyed by
+        # (relative path, patterns). README.md alone is searched by six checks
+        self._file_cache: Dict[str, bytes] = {}
+        self._scan_cache: Dict[tuple[str, tuple[str, ...]], List[Dict]] = {}
+        
+        # Worker pool for large scans, started on first use and shared by
+        # the category threads of one analysis; see _scan_pending
+        self._scan_pool: Optional[ProcessPoolExecutor] = None
+        self._scan_pool_broken = False
+        self._scan_pool_lock = threading.Lock()
     
     def analyze_repository(self, repo_path: str) -> AnalysisResult:
         """
@@ -57,48 +701,48 @@ class RepositoryAnalyzer:
         Returns:
             AnalysisResult with scores and recommendations
         """
-        import datetime
+        # Re-walk the tree for every analysis. The index is built here,
+        # before the checks start, so the worker threads below only read it
+        self._index = None
+        self._get_index(repo_path)
         
         # Get repo metadata
-        commit_hash = self._get_commit_hash(repo_path)
+        commit_hash, repo_url = self._read_git_meta(repo_path)
         timestamp = datetime.datetime.utcnow().isoformat()
         
-        # Run all checks
+        # Run all checks. Each category is an independent, I/O-bound scan
+        # over the same tree, so they run concurrently; results are merged
+        # in the fixed order below to keep the output deterministic
         check_results = []
         raw_findings = {}
         
-        # Environment checks
-        env_results, env_findings = self._check_environment(repo_path)
-        check_results.extend(env_results)
-        raw_findings['environment'] = env_findings
+        category_checks = [
+            ('environment', self._check_environment),
+            ('randomness', self._check_randomness),
+            ('data', self._check_data_availability),
+            ('documentation', self._check_documentation),
+            ('testing', self._check_testing),
+        ]
         
-        # Randomness checks
-        random_results, random_findings = self._check_randomness(repo_path)
-        check_results.extend(random_results)
-        raw_findings['randomness'] = random_findings
-        
-        # Data availability checks
-        data_results, data_findings = self._check_data_availability(repo_path)
-        check_results.extend(data_results)
-        raw_findings['data'] = data_findings
-        
-        # Documentation checks
-        doc_results, doc_findings = self._check_documentation(repo_path)
-        check_results.extend(doc_results)
-        raw_findings['documentation'] = doc_findings
-        
-        # Testing checks
-        test_results, test_findings = self._check_testing(repo_path)
-        check_results.extend(test_results)
-        raw_findings['testing'] = test_findings
+        try:
+            with ThreadPoolExecutor(max_workers=len(category_checks)) as executor:
+                futures = {
+                    name: executor.submit(check, repo_path)
+                    for name, check in category_checks
+                }
+                for name, future in futures.items():
+                    results, findings = future.result()
+                    check_results.extend(results)
+                    raw_findings[name] = findings
+        finally:
+            self._close_scan_pool()
         
         # Calculate scores
-        score_data = self.scorer.calculate_score(check_results)
-        recommendations = self.scorer.generate_recommendations(check_results)
+        score_data, recommendations = self.scorer.score_and_recommend(check_results)
         badge_data = self.scorer.format_badge_data(score_data['overall_score'])
         
         return AnalysisResult(
-            repo_url=self._get_repo_url(repo_path),
+            repo_url=repo_url,
             commit_hash=commit_hash,
             timestamp=timestamp,
             check_results=check_results,
@@ -119,14 +763,7 @@ class RepositoryAnalyzer:
         findings['found_env_files'] = found_files
         
         env_file_check = self.checks['environment']['items'][0]
-        results.append(CheckResult(
-            check_id=env_file_check['id'],
-            passed=len(found_files) > 0,
-            points_earned=env_file_check['points'] if found_files else 0,
-            points_possible=env_file_check['points'],
-            category='environment',
-            message=env_file_check['name']
-        ))
+        results.append(self._make_result(env_file_check, 'environment', len(found_files) > 0))
         
         # Check dependency pinning
         pinned, total_deps = self._check_dependency_pinning(repo_path, found_files)
@@ -137,14 +774,7 @@ class RepositoryAnalyzer:
         pinning_ratio = pinned / total_deps if total_deps > 0 else 0
         passed = pinning_ratio >= 0.9  # 90% pinned = pass
         
-        results.append(CheckResult(
-            check_id=pin_check['id'],
-            passed=passed,
-            points_earned=int(pin_check['points'] * pinning_ratio),
-            points_possible=pin_check['points'],
-            category='environment',
-            message=pin_check['name']
-        ))
+        results.append(self._make_result(pin_check, 'environment', passed, ratio=pinning_ratio))
         
         # Check Python version
         py_version_files = self.checks['environment']['items'][2]['files']
@@ -152,14 +782,7 @@ class RepositoryAnalyzer:
         findings['python_version_files'] = found_py_files
         
         py_check = self.checks['environment']['items'][2]
-        results.append(CheckResult(
-            check_id=py_check['id'],
-            passed=len(found_py_files) > 0,
-            points_earned=py_check['points'] if found_py_files else 0,
-            points_possible=py_check['points'],
-            category='environment',
-            message=py_check['name']
-        ))
+        results.append(self._make_result(py_check, 'environment', len(found_py_files) > 0))
         
         return results, findings
     
@@ -174,31 +797,16 @@ class RepositoryAnalyzer:
         findings['seed_matches'] = seed_matches
         
         seed_check = self.checks['randomness']['items'][0]
-        results.append(CheckResult(
-            check_id=seed_check['id'],
-            passed=len(seed_matches) > 0,
-            points_earned=seed_check['points'] if seed_matches else 0,
-            points_possible=seed_check['points'],
-            category='randomness',
-            message=seed_check['name']
-        ))
+        results.append(self._make_result(seed_check, 'randomness', len(seed_matches) > 0))
         
         # Check for seed documentation
-        doc_patterns = [r'seed.*=.*\d+', r'random.*seed', r'reproducib']
         doc_matches = self._search_code_patterns(
-            repo_path, doc_patterns, ['README.md', '*.md', '*.py']
+            repo_path, _SEED_DOC_PATTERNS, ['README.md', '*.md', '*.py']
         )
         findings['seed_documentation'] = doc_matches
         
         doc_check = self.checks['randomness']['items'][1]
-        results.append(CheckResult(
-            check_id=doc_check['id'],
-            passed=len(doc_matches) > 0,
-            points_earned=doc_check['points'] if doc_matches else 0,
-            points_possible=doc_check['points'],
-            category='randomness',
-            message=doc_check['name']
-        ))
+        results.append(self._make_result(doc_check, 'randomness', len(doc_matches) > 0))
         
         # Check for deterministic flags
         det_patterns = self.checks['randomness']['items'][2]['patterns']
@@ -206,14 +814,7 @@ class RepositoryAnalyzer:
         findings['deterministic_flags'] = det_matches
         
         det_check = self.checks['randomness']['items'][2]
-        results.append(CheckResult(
-            check_id=det_check['id'],
-            passed=len(det_matches) > 0,
-            points_earned=det_check['points'] if det_matches else 0,
-            points_possible=det_check['points'],
-            category='randomness',
-            message=det_check['name']
-        ))
+        results.append(self._make_result(det_check, 'randomness', len(det_matches) > 0))
         
         return results, findings
     
@@ -230,14 +831,7 @@ class RepositoryAnalyzer:
         findings['data_availability_statements'] = data_matches
         
         avail_check = self.checks['data']['items'][0]
-        results.append(CheckResult(
-            check_id=avail_check['id'],
-            passed=len(data_matches) > 0,
-            points_earned=avail_check['points'] if data_matches else 0,
-            points_possible=avail_check['points'],
-            category='data',
-            message=avail_check['name']
-        ))
+        results.append(self._make_result(avail_check, 'data', len(data_matches) > 0))
         
         # Check for data scripts
         data_script_files = self.checks['data']['items'][1]['files']
@@ -245,14 +839,7 @@ class RepositoryAnalyzer:
         findings['data_scripts'] = found_scripts
         
         script_check = self.checks['data']['items'][1]
-        results.append(CheckResult(
-            check_id=script_check['id'],
-            passed=len(found_scripts) > 0,
-            points_earned=script_check['points'] if found_scripts else 0,
-            points_possible=script_check['points'],
-            category='data',
-            message=script_check['name']
-        ))
+        results.append(self._make_result(script_check, 'data', len(found_scripts) > 0))
         
         # Check for sample data
         data_dirs = self.checks['data']['items'][2]['directories']
@@ -260,14 +847,7 @@ class RepositoryAnalyzer:
         findings['data_directories'] = found_dirs
         
         sample_check = self.checks['data']['items'][2]
-        results.append(CheckResult(
-            check_id=sample_check['id'],
-            passed=len(found_dirs) > 0,
-            points_earned=sample_check['points'] if found_dirs else 0,
-            points_possible=sample_check['points'],
-            category='data',
-            message=sample_check['name']
-        ))
+        results.append(self._make_result(sample_check, 'data', len(found_dirs) > 0))
         
         return results, findings
     
@@ -282,14 +862,7 @@ class RepositoryAnalyzer:
         findings['readme_files'] = found_readme
         
         readme_check = self.checks['documentation']['items'][0]
-        results.append(CheckResult(
-            check_id=readme_check['id'],
-            passed=len(found_readme) > 0,
-            points_earned=readme_check['points'] if found_readme else 0,
-            points_possible=readme_check['points'],
-            category='documentation',
-            message=readme_check['name']
-        ))
+        results.append(self._make_result(readme_check, 'documentation', len(found_readme) > 0))
         
         # Check for installation instructions
         install_patterns = self.checks['documentation']['items'][1]['patterns']
@@ -299,14 +872,7 @@ class RepositoryAnalyzer:
         findings['installation_instructions'] = install_matches
         
         install_check = self.checks['documentation']['items'][1]
-        results.append(CheckResult(
-            check_id=install_check['id'],
-            passed=len(install_matches) > 0,
-            points_earned=install_check['points'] if install_matches else 0,
-            points_possible=install_check['points'],
-            category='documentation',
-            message=install_check['name']
-        ))
+        results.append(self._make_result(install_check, 'documentation', len(install_matches) > 0))
         
         # Check for usage examples
         usage_patterns = self.checks['documentation']['items'][2]['patterns']
@@ -316,14 +882,7 @@ class RepositoryAnalyzer:
         findings['usage_examples'] = usage_matches
         
         usage_check = self.checks['documentation']['items'][2]
-        results.append(CheckResult(
-            check_id=usage_check['id'],
-            passed=len(usage_matches) > 0,
-            points_earned=usage_check['points'] if usage_matches else 0,
-            points_possible=usage_check['points'],
-            category='documentation',
-            message=usage_check['name']
-        ))
+        results.append(self._make_result(usage_check, 'documentation', len(usage_matches) > 0))
         
         # Check for expected output documentation
         output_patterns = self.checks['documentation']['items'][3]['patterns']
@@ -333,14 +892,7 @@ class RepositoryAnalyzer:
         findings['expected_output'] = output_matches
         
         output_check = self.checks['documentation']['items'][3]
-        results.append(CheckResult(
-            check_id=output_check['id'],
-            passed=len(output_matches) > 0,
-            points_earned=output_check['points'] if output_matches else 0,
-            points_possible=output_check['points'],
-            category='documentation',
-            message=output_check['name']
-        ))
+        results.append(self._make_result(output_check, 'documentation', len(output_matches) > 0))
         
         return results, findings
     
@@ -361,14 +913,7 @@ class RepositoryAnalyzer:
         
         test_check = self.checks['testing']['items'][0]
         has_tests = len(found_test_dirs) > 0 or len(test_files) > 0
-        results.append(CheckResult(
-            check_id=test_check['id'],
-            passed=has_tests,
-            points_earned=test_check['points'] if has_tests else 0,
-            points_possible=test_check['points'],
-            category='testing',
-            message=test_check['name']
-        ))
+        results.append(self._make_result(test_check, 'testing', has_tests))
         
         # Check for CI/CD
         ci_files = self.checks['testing']['items'][1]['files']
@@ -376,14 +921,7 @@ class RepositoryAnalyzer:
         findings['ci_files'] = found_ci
         
         ci_check = self.checks['testing']['items'][1]
-        results.append(CheckResult(
-            check_id=ci_check['id'],
-            passed=len(found_ci) > 0,
-            points_earned=ci_check['points'] if found_ci else 0,
-            points_possible=ci_check['points'],
-            category='testing',
-            message=ci_check['name']
-        ))
+        results.append(self._make_result(ci_check, 'testing', len(found_ci) > 0))
         
         # Check for coverage tools
         coverage_patterns = self.checks['testing']['items'][2]['patterns']
@@ -393,57 +931,195 @@ class RepositoryAnalyzer:
         findings['coverage_config'] = coverage_matches
         
         cov_check = self.checks['testing']['items'][2]
-        results.append(CheckResult(
-            check_id=cov_check['id'],
-            passed=len(coverage_matches) > 0,
-            points_earned=cov_check['points'] if coverage_matches else 0,
-            points_possible=cov_check['points'],
-            category='testing',
-            message=cov_check['name']
-        ))
+        results.append(self._make_result(cov_check, 'testing', len(coverage_matches) > 0))
         
         return results, findings
     
     # Helper methods
     
+    def _make_result(
+        self, check: Dict, category: str, passed: bool, ratio: Optional[float] = None
+    ) -> CheckResult:
+        """
+        Build the CheckResult for a check definition from checks.json.
+        
+        Args:
+            check: Check item from the config
+            category: Category the check belongs to
+            passed: Whether the check passed
+            ratio: Fraction of points earned for partially-scored checks;
+                otherwise it is all points on pass, none on failure
+        """
+        points = check['points']
+        if ratio is None:
+            earned = points if passed else 0
+        else:
+            earned = int(points * ratio)
+        
+        return CheckResult(
+            check_id=check['id'],
+            passed=passed,
+            points_earned=earned,
+            points_possible=points,
+            category=category,
+            message=check['name']
+        )
+    
+    def _get_index(self, repo_path: str) -> Dict:
+        """Walk the repository once and index its entries.
+        
+        All paths are stored relative to the repository root, using '/' as
+        separator. ``by_name`` and ``by_suffix`` map basenames and file
+        suffixes to those paths, and ``files_by_dir`` / ``dirs_by_dir`` map
+        each directory ('' for the root) to its direct children, so most
+        lookups avoid a scan.
+        
+        Git checkouts are indexed from ``git ls-files`` (which also honours
+        .gitignore); anything else falls back to walking the tree.
+        """
+        if self._index is not None and self._index_root == repo_path:
+            return self._index
+        
+        index = {
+            'all_files': [],
+            'all_dirs': set(),
+            'by_name': defaultdict(list),
+            'by_suffix': defaultdict(list),
+            'files_by_dir': defaultdict(list),
+            'dirs_by_dir': defaultdict(list),
+        }
+        
+        tracked = _git_ls_files(repo_path)
+        if tracked is not None:
+            # A git checkout already knows its file list; no walk needed.
+            # Submodules are registered as directories like their parents
+            for rel, is_submodule in tracked.items():
+                parts = rel.split('/')
+                if _EXCLUDE_DIRS.intersection(parts if is_submodule else parts[:-1]):
+                    continue
+                
+                # Register parent directories the first time they are seen
+                for depth in range(1, len(parts) + is_submodule):
+                    parent = '/'.join(parts[:depth])
+                    if parent not in index['all_dirs']:
+                        index['all_dirs'].add(parent)
+                        index['by_name'][parts[depth - 1]].append(parent)
+                        index['dirs_by_dir']['/'.join(parts[:depth - 1])].append(parent)
+                if is_submodule:
+                    continue
+                
+                name = parts[-1]
+                index['by_name'][name].append(rel)
+                index['all_files'].append(rel)
+                index['by_suffix'][os.path.splitext(name)[1]].append(rel)
+                index['files_by_dir']['/'.join(parts[:-1])].append(rel)
+        else:
+            # os.walk works on plain strings (no Path object per entry) and
+            # lets us prune subtrees that never hold anything worth scoring.
+            # Every root below the top starts with repo_path plus a
+            # separator, so relative paths are a slice rather than relpath()
+            root_offset = len(os.path.join(repo_path, ''))
+            for root, dirs, files in os.walk(repo_path, followlinks=False):
+                dirs[:] = [d for d in dirs if d not in _EXCLUDE_DIRS]
+                
+                rel_root = root[root_offset:]
+                prefix = rel_root.replace(os.sep, '/') + '/' if rel_root else ''
+                
+                rel_dir = prefix[:-1]
+                for name in dirs:
+                    rel = prefix + name
+                    index['by_name'][name].append(rel)
+                    index['all_dirs'].add(rel)
+                    index['dirs_by_dir'][rel_dir].append(rel)
+                
+                for name in files:
+                    rel = prefix + name
+                    index['by_name'][name].append(rel)
+                    index['all_files'].append(rel)
+                    index['by_suffix'][os.path.splitext(name)[1]].append(rel)
+                    index['files_by_dir'][rel_dir].append(rel)
+        
+        self._index = index
+        self._index_root = repo_path
+        self._file_cache = {}
+        self._scan_cache = {}
+        return index
+    
+    def _glob(self, repo_path: str, pattern: str) -> List[str]:
+        """Paths matching a glob anchored at the repository root."""
+        index = self._get_index(repo_path)
+        pattern = pattern.rstrip('/')
+        depth = pattern.count('/')
+        
+        parent = pattern.rpartition('/')[0]
+        if not any(c in parent for c in '*?['):
+            # The directory is spelled out (e.g. .github/workflows/*.yml or a
+            # root-level name), so only its direct children can match
+            candidates = index['files_by_dir'].get(parent, []) + \
+                sorted(index['dirs_by_dir'].get(parent, []))
+            return fnmatch.filter(candidates, pattern)
+        
+        candidates = index['all_files'] + sorted(index['all_dirs'])
+        return [
+            p for p in fnmatch.filter(candidates, pattern)
+            if p.count('/') == depth
+        ]
+    
+    def _rglob(self, repo_path: str, pattern: str) -> List[str]:
+        """Paths matching a glob at any depth (``Path.rglob`` semantics)."""
+        index = self._get_index(repo_path)
+        by_name = index['by_name']
+        
+        if '/' in pattern:
+            candidates = index['all_files'] + sorted(index['all_dirs'])
+            return [p for p in candidates if PurePosixPath(p).match(pattern)]
+        
+        if not any(c in pattern for c in '*?['):
+            return list(by_name.get(pattern, []))
+        
+        suffix = pattern[1:]
+        if pattern.startswith('*.') and suffix.count('.') == 1 and \
+                not any(c in suffix for c in '*?['):
+            return list(index['by_suffix'].get(suffix, []))
+        
+        found = []
+        for name in fnmatch.filter(by_name, pattern):
+            found.extend(by_name[name])
+        return found
+    
     def _find_files(self, repo_path: str, filenames: List[str]) -> List[str]:
         """Find files matching given names."""
         found = []
-        repo = Path(repo_path)
         
         for filename in filenames:
             # Handle glob patterns
             if '*' in filename or '/' in filename:
-                matches = list(repo.glob(filename))
-                found.extend([str(m.relative_to(repo)) for m in matches])
+                found.extend(self._glob(repo_path, filename))
             else:
                 # Exact filename search
-                for path in repo.rglob(filename):
-                    found.append(str(path.relative_to(repo)))
+                found.extend(self._rglob(repo_path, filename))
         
         return found
     
     def _find_files_by_pattern(self, repo_path: str, patterns: List[str]) -> List[str]:
         """Find files matching glob patterns."""
         found = []
-        repo = Path(repo_path)
         
         for pattern in patterns:
-            matches = list(repo.rglob(pattern))
-            found.extend([str(m.relative_to(repo)) for m in matches])
+            found.extend(self._rglob(repo_path, pattern))
         
         return found
     
     def _find_directories(self, repo_path: str, dir_names: List[str]) -> List[str]:
         """Find directories matching given names."""
         found = []
-        repo = Path(repo_path)
+        all_dirs = self._get_index(repo_path)['all_dirs']
         
         for dir_name in dir_names:
             dir_name_clean = dir_name.rstrip('/')
-            for path in repo.rglob(dir_name_clean):
-                if path.is_dir():
-                    found.append(str(path.relative_to(repo)))
+            for path in self._rglob(repo_path, dir_name_clean):
+                if path in all_dirs:
+                    found.append(path)
         
         return found
     
@@ -452,35 +1128,92 @@ class RepositoryAnalyzer:
     ) -> List[Dict]:
         """Search for regex patterns in specified files."""
         matches = []
-        repo = Path(repo_path)
+        all_dirs = self._get_index(repo_path)['all_dirs']
         
         # Find all matching files
         files_to_search = set()
         for glob in file_globs:
-            files_to_search.update(repo.rglob(glob))
+            files_to_search.update(
+                p for p in self._rglob(repo_path, glob) if p not in all_dirs
+            )
         
-        # Search each file
-        for file_path in files_to_search:
-            if not file_path.is_file():
-                continue
-            
-            try:
-                content = file_path.read_text(errors='ignore')
-                
-                for pattern in patterns:
-                    regex = re.compile(pattern, re.IGNORECASE)
-                    for match in regex.finditer(content):
-                        matches.append({
-                            'file': str(file_path.relative_to(repo)),
-                            'pattern': pattern,
-                            'match': match.group(),
-                            'line': content[:match.start()].count('\n') + 1
-                        })
-            except Exception:
-                continue
+        if not patterns:
+            return matches
+        
+        # Files already scanned for this exact pattern list are served from
+        # the cache; only the rest are read and matched
+        key = tuple(patterns)
+        pending = [
+            p for p in sorted(files_to_search) if (p, key) not in self._scan_cache
+        ]
+        
+        if pending:
+            # One alternation over all patterns (compiled once per process)
+            # so each file is scanned in a single pass; the group that
+            # matched tells us which pattern it was
+            regex = _compile_alternation(key)
+            found = defaultdict(list)
+            for match in self._scan_pending(repo_path, pending, regex, patterns):
+                found[match['file']].append(match)
+            for rel_path in pending:
+                self._scan_cache[(rel_path, key)] = found.get(rel_path, [])
+        
+        for rel_path in sorted(files_to_search):
+            matches.extend(self._scan_cache[(rel_path, key)])
         
         return matches
     
+    def _scan_pending(
+        self, repo_path: str, files: List[str], regex: re.Pattern, patterns: List[str]
+    ) -> List[Dict]:
+        """Scan files in-process, or across worker processes if there is a lot."""
+        # Large scans are sharded across worker processes, since the regex
+        # work holds the GIL; anything smaller than the pool's start-up cost,
+        # or a machine with one usable CPU, stays in-process
+        workers = min(_available_cpus(), len(files))
+        if workers <= 1 or self._scan_pool_broken or \
+                _pending_scan_bytes(repo_path, files, self._file_cache) < _PARALLEL_SCAN_MIN_BYTES:
+            return _scan_files(repo_path, files, regex, patterns, self._file_cache)
+        
+        chunk_size = -(-len(files) // workers)
+        chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+        
+        try:
+            matches = []
+            for chunk_matches in self._get_scan_pool(workers).map(
+                _scan_files,
+                [repo_path] * len(chunks), chunks,
+                [regex] * len(chunks), [patterns] * len(chunks)
+            ):
+                matches.extend(chunk_matches)
+            return matches
+        except BrokenProcessPool:
+            # Workers can die at start-up, e.g. when the fork server can't
+            # re-import a caller's __main__; scan here instead from now on
+            with self._scan_pool_lock:
+                pool, self._scan_pool = self._scan_pool, None
+                self._scan_pool_broken = True
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            return _scan_files(repo_path, files, regex, patterns, self._file_cache)
+    
+    def _get_scan_pool(self, workers: int) -> ProcessPoolExecutor:
+        """The analysis' worker pool, started on first use."""
+        with self._scan_pool_lock:
+            if self._scan_pool is None:
+                self._scan_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=_scan_mp_context()
+                )
+            return self._scan_pool
+    
+    def _close_scan_pool(self):
+        """Shut down the worker pool, if one was started."""
+        with self._scan_pool_lock:
+            pool, self._scan_pool = self._scan_pool, None
+            self._scan_pool_broken = False
+        if pool is not None:
+            pool.shutdown()
+    
     def _check_dependency_pinning(
         self, repo_path: str, env_files: List[str]
     ) -> tuple[int, int]:
@@ -491,47 +1224,76 @@ class RepositoryAnalyzer:
         
         for env_file in env_files:
             file_path = repo / env_file
-            if not file_path.exists():
+            if not file_path.is_file():
                 continue
             
-            content = file_path.read_text(errors='ignore')
-            
             if 'requirements' in env_file:
-                # Parse requirements.txt
-                for line in content.split('\n'):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    total += 1
-                    # Check for exact version pinning (==)
-                    if '==' in line:
-                        pinned += 1
+                # Parse requirements.txt with one C-level regex pass per count
+                # over the raw bytes. Blank, comment and option lines (-r, -e,
+                # --index-url) don't start with an alphanumeric, so they are
+                # not counted. A leading UTF-8 BOM would hide the first line
+                content = file_path.read_bytes().removeprefix(codecs.BOM_UTF8)
+                total += len(_REQ_LINE_RE.findall(content))
+                # Check for exact version pinning (==) right after the name
+                pinned += len(_REQ_PINNED_RE.findall(content))
             
             elif 'environment.yml' in env_file:
-                # Parse conda environment
-                import yaml
-                try:
-                    env_config = yaml.safe_load(content)
-                    if 'dependencies' in env_config:
-                        for dep in env_config['dependencies']:
-                            if isinstance(dep, str):
-                                total += 1
-                                if '=' in dep or '==' in dep:
-                                    pinned += 1
-                except Exception:
-                    pass
+                # Parse conda environment. Ordinary block-style files are
+                # handled by a line scanner; PyYAML is only needed for the rest
+                content = file_path.read_text(errors='ignore')
+                deps = _scan_conda_dependencies(content)
+                if deps is None and yaml is not None:
+                    try:
+                        env_config = yaml.safe_load(content)
+                        deps = [
+                            dep for dep in env_config.get('dependencies') or []
+                            if isinstance(dep, str)
+                        ]
+                    except Exception:
+                        pass
+                
+                for dep in deps or []:
+                    total += 1
+                    if '=' in dep or '==' in dep:
+                        pinned += 1
             
             elif 'pyproject.toml' in env_file:
-                # Parse pyproject.toml (simplified)
-                for line in content.split('\n'):
-                    if '=' in line and '"' in line:
-                        total += 1
-                        if '==' in line:
-                            pinned += 1
+                # Parse pyproject.toml properly rather than guessing from
+                # lines that contain '=' and a quote
+                try:
+                    with open(file_path, 'rb') as f:
+                        file_pinned, file_total = _count_pyproject_pins(tomllib.load(f))
+                except (tomllib.TOMLDecodeError, UnicodeDecodeError):
+                    continue
+                pinned += file_pinned
+                total += file_total
         
         return pinned, total
     
+    def _read_git_meta(self, repo_path: str) -> tuple[str, str]:
+        """
+        Get commit hash and origin URL, reading .git directly where possible.
+        
+        Avoids forking git for plain checkouts; falls back to the git CLI
+        for anything the files don't answer (e.g. repo_path is a
+        subdirectory, or refs this reader doesn't understand).
+        """
+        commit_hash = None
+        repo_url = None
+        
+        git_dir = _resolve_git_dir(repo_path)
+        if git_dir is not None:
+            common_dir = _git_common_dir(git_dir)
+            commit_hash = _read_head_commit(git_dir, common_dir)
+            repo_url = _read_origin_url(common_dir)
+        
+        if commit_hash is None:
+            commit_hash = self._get_commit_hash(repo_path)
+        if repo_url is None:
+            repo_url = self._get_repo_url(repo_path)
+        
+        return commit_hash, repo_url
+    
     def _get_commit_hash(self, repo_path: str) -> str:
         """Get current git commit hash."""
         try:
@@ -559,26 +1321,46 @@ class RepositoryAnalyzer:
             return 'unknown'
 
 
-def analyze_repo_from_url(repo_url: str, checks_config: str = "data/checks.json") -> Dict:
+# Files whose contents the checks read (gitignore syntax); must cover every
+# glob passed to _search_code_patterns and the files _check_dependency_pinning
+# parses
+_SPARSE_CHECKOUT_PATTERNS = [
+    '*.md', '*.py', '*.cfg', '*.ini', '*.yml', '*.yaml',
+    'requirements*.txt', 'pyproject.toml',
+]
+
+
+def analyze_repo_from_url(repo_url: str, checks_config: str = "data/checks.json",
+                          scorer: Optional[ReproducibilityScorer] = None) -> Dict:
     """
     Clone and analyze a repository from URL.
     
     Args:
         repo_url: GitHub/GitLab repository URL
         checks_config: Path to checks configuration
+        scorer: Scorer to reuse across calls (e.g. by a long-running server)
         
     Returns:
         Analysis result as dictionary
     """
-    import tempfile
-    import shutil
-    
     with tempfile.TemporaryDirectory() as tmpdir:
-        # Clone repository
-        subprocess.run(['git', 'clone', '--depth', '1', repo_url, tmpdir], check=True)
+        # Clone repository: history-free and without blobs, then check out
+        # only the files whose contents are read. Everything else still
+        # appears in the index, which is what file/directory checks use
+        subprocess.run(
+            ['git', 'clone', '--depth', '1', '--filter=blob:none', '--no-checkout',
+             '--', repo_url, tmpdir],
+            check=True
+        )
+        # If sparse checkout isn't supported, the checkout below is a full one
+        subprocess.run(
+            ['git', '-C', tmpdir, 'sparse-checkout', 'set', '--no-cone',
+             *_SPARSE_CHECKOUT_PATTERNS]
+        )
+        subprocess.run(['git', '-C', tmpdir, 'checkout', '--quiet'], check=True)
         
         # Run analysis
-        analyzer = RepositoryAnalyzer(checks_config)
+        analyzer = RepositoryAnalyzer(checks_config, scorer=scorer)
         result = analyzer.analyze_repository(tmpdir)
         
         # Convert to dict for JSON serialization
@@ -600,6 +1382,9 @@ if __name__ == '__main__':
     if len(sys.argv) > 1:
         repo_url = sys.argv[1]
         result = analyze_repo_from_url(repo_url)
-        print(json.dumps(result, indent=2))
+        if orjson is not None:
+            sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b'\n')
+        else:
+            print(json.dumps(result, indent=2))
     else:
         print("Usage: python analyze.py <repo_url>")
@@ -5,9 +5,66 @@ Creates dynamic badges for reproducibility scores.
 Designed to work in Cloudflare Workers environment.
 """
 
+import bisect
 from typing import Dict
 
 
+# Rating bands: a score at or above _RATING_BOUNDS[i] earns _RATINGS[i + 1].
+# _RATING_COLORS runs parallel to _RATINGS
+_RATING_BOUNDS = (40, 60, 75, 90)
+_RATINGS = ('critical', 'poor', 'fair', 'good', 'excellent')
+_RATING_COLORS = ('#e05d44', '#fe7d37', '#dfb317', '#97ca00', '#44cc11')
+_COLOR_BY_RATING = dict(zip(_RATINGS, _RATING_COLORS))
+
+# SVG skeletons, filled in with str.format by the generators below
+_BADGE_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{total_width}" height="20" role="img" aria-label="reproducibility: {score_text}">
+    <title>reproducibility: {score_text}</title>
+    <linearGradient id="s" x2="0" y2="100%">
+        <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
+        <stop offset="1" stop-opacity=".1"/>
+    </linearGradient>
+    <clipPath id="r">
+        <rect width="{total_width}" height="20" rx="3" fill="#fff"/>
+    </clipPath>
+    <g clip-path="url(#r)">
+        <rect width="{label_width}" height="20" fill="#555"/>
+        <rect x="{label_width}" width="{score_width}" height="20" fill="{color}"/>
+        <rect width="{total_width}" height="20" fill="url(#s)"/>
+    </g>
+    <g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" text-rendering="geometricPrecision" font-size="110">
+        <text aria-hidden="true" x="{label_x}" y="150" fill="#010101" fill-opacity=".3" transform="scale(.1)" textLength="{label_length}">reproducibility</text>
+        <text x="{label_x}" y="140" transform="scale(.1)" fill="#fff" textLength="{label_length}">reproducibility</text>
+        <text aria-hidden="true" x="{score_x}" y="150" fill="#010101" fill-opacity=".3" transform="scale(.1)" textLength="{score_length}">{score_text}</text>
+        <text x="{score_x}" y="140" transform="scale(.1)" fill="#fff" textLength="{score_length}">{score_text}</text>
+    </g>
+</svg>'''
+
+_DETAILED_BADGE_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">
+    <title>Reproducibility Score: {overall}/100</title>
+    
+    <!-- Header -->
+    <rect width="{width}" height="20" rx="3" fill="{main_color}"/>
+    <text x="{half_width}" y="14" font-family="Verdana,sans-serif" font-size="11" fill="#fff" text-anchor="middle" font-weight="bold">
+        Reproducibility: {overall}/100
+    </text>
+    
+    <!-- Category breakdown -->
+    {category_rects}
+    {category_texts}
+</svg>'''
+
+# One category row of the detailed badge: background and score bar, then
+# label and value
+_CATEGORY_RECTS_TEMPLATE = (
+    '<rect x="5" y="{y}" width="190" height="14" rx="2" fill="#f5f5f5"/>\n'
+    '<rect x="70" y="{bar_y}" width="{bar_width}" height="12" rx="2" fill="{color}"/>'
+)
+_CATEGORY_TEXTS_TEMPLATE = (
+    '<text x="8" y="{text_y}" font-family="Verdana,sans-serif" font-size="9" fill="#333">{label}</text>\n'
+    '<text x="193" y="{text_y}" font-family="Verdana,sans-serif" font-size="9" fill="#333" text-anchor="end">{score}</text>'
+)
+
+
 def generate_badge_svg(score: float, rating: str) -> str:
     """
     Generate SVG badge for reproducibility score.
@@ -19,16 +76,7 @@ def generate_badge_svg(score: float, rating: str) -> str:
     Returns:
         SVG markup as string
     """
-    # Color mapping
-    color_map = {
-        'excellent': '#44cc11',
-        'good': '#97ca00',
-        'fair': '#dfb317',
-        'poor': '#fe7d37',
-        'critical': '#e05d44'
-    }
-    
-    color = color_map.get(rating, '#9f9f9f')
+    color = _COLOR_BY_RATING.get(rating, '#9f9f9f')
     score_text = f"{int(score)}/100"
     
     # Calculate text widths (approximate)
@@ -36,29 +84,17 @@ def generate_badge_svg(score: float, rating: str) -> str:
     score_width = 50
     total_width = label_width + score_width
     
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{total_width}" height="20" role="img" aria-label="reproducibility: {score_text}">
-    <title>reproducibility: {score_text}</title>
-    <linearGradient id="s" x2="0" y2="100%">
-        <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
-        <stop offset="1" stop-opacity=".1"/>
-    </linearGradient>
-    <clipPath id="r">
-        <rect width="{total_width}" height="20" rx="3" fill="#fff"/>
-    </clipPath>
-    <g clip-path="url(#r)">
-        <rect width="{label_width}" height="20" fill="#555"/>
-        <rect x="{label_width}" width="{score_width}" height="20" fill="{color}"/>
-        <rect width="{total_width}" height="20" fill="url(#s)"/>
-    </g>
-    <g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" text-rendering="geometricPrecision" font-size="110">
-        <text aria-hidden="true" x="{label_width/2 * 10}" y="150" fill="#010101" fill-opacity=".3" transform="scale(.1)" textLength="{(label_width-10)*10}">reproducibility</text>
-        <text x="{label_width/2 * 10}" y="140" transform="scale(.1)" fill="#fff" textLength="{(label_width-10)*10}">reproducibility</text>
-        <text aria-hidden="true" x="{(label_width + score_width/2) * 10}" y="150" fill="#010101" fill-opacity=".3" transform="scale(.1)" textLength="{(score_width-10)*10}">{score_text}</text>
-        <text x="{(label_width + score_width/2) * 10}" y="140" transform="scale(.1)" fill="#fff" textLength="{(score_width-10)*10}">{score_text}</text>
-    </g>
-</svg>'''
-    
-    return svg
+    return _BADGE_TEMPLATE.format(
+        total_width=total_width,
+        label_width=label_width,
+        score_width=score_width,
+        color=color,
+        score_text=score_text,
+        label_x=label_width / 2 * 10,
+        label_length=(label_width - 10) * 10,
+        score_x=(label_width + score_width / 2) * 10,
+        score_length=(score_width - 10) * 10
+    )
 
 
 def generate_detailed_badge_svg(score_data: Dict) -> str:
@@ -75,79 +111,42 @@ def generate_detailed_badge_svg(score_data: Dict) -> str:
     rating = score_data['rating']
     categories = score_data['category_scores']
     
-    color_map = {
-        'excellent': '#44cc11',
-        'good': '#97ca00',
-        'fair': '#dfb317',
-        'poor': '#fe7d37',
-        'critical': '#e05d44'
-    }
-    
-    main_color = color_map.get(rating, '#9f9f9f')
+    main_color = _COLOR_BY_RATING.get(rating, '#9f9f9f')
     
     # Build category lines
     y_offset = 25
     height = 20 + (len(categories) * 18)
     width = 200
     
-    category_rects = []
-    category_texts = []
-    
+    rows = []
     for i, (cat_name, cat_data) in enumerate(categories.items()):
         cat_score = cat_data['score']
-        cat_rating = get_rating_from_score(cat_score)
-        cat_color = color_map.get(cat_rating, '#9f9f9f')
-        
         y = y_offset + (i * 18)
-        
-        # Background rect
-        category_rects.append(
-            f'<rect x="5" y="{y}" width="190" height="14" rx="2" fill="#f5f5f5"/>'
-        )
-        
-        # Score bar (proportional width)
-        bar_width = int((cat_score / 100) * 120)
-        category_rects.append(
-            f'<rect x="70" y="{y+1}" width="{bar_width}" height="12" rx="2" fill="{cat_color}"/>'
-        )
-        
-        # Text
-        category_texts.append(
-            f'<text x="8" y="{y+10}" font-family="Verdana,sans-serif" font-size="9" fill="#333">{cat_name[:3].upper()}</text>'
-        )
-        category_texts.append(
-            f'<text x="193" y="{y+10}" font-family="Verdana,sans-serif" font-size="9" fill="#333" text-anchor="end">{int(cat_score)}</text>'
-        )
-    
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">
-    <title>Reproducibility Score: {int(overall)}/100</title>
-    
-    <!-- Header -->
-    <rect width="{width}" height="20" rx="3" fill="{main_color}"/>
-    <text x="{width/2}" y="14" font-family="Verdana,sans-serif" font-size="11" fill="#fff" text-anchor="middle" font-weight="bold">
-        Reproducibility: {int(overall)}/100
-    </text>
-    
-    <!-- Category breakdown -->
-    {chr(10).join(category_rects)}
-    {chr(10).join(category_texts)}
-</svg>'''
-    
-    return svg
+        rows.append({
+            'y': y,
+            'bar_y': y + 1,
+            'text_y': y + 10,
+            # Score bar (proportional width)
+            'bar_width': int((cat_score / 100) * 120),
+            'color': _COLOR_BY_RATING.get(get_rating_from_score(cat_score), '#9f9f9f'),
+            'label': cat_name[:3].upper(),
+            'score': int(cat_score),
+        })
+    
+    return _DETAILED_BADGE_TEMPLATE.format(
+        width=width,
+        height=height,
+        half_width=width / 2,
+        main_color=main_color,
+        overall=int(overall),
+        category_rects='\n'.join(_CATEGORY_RECTS_TEMPLATE.format_map(row) for row in rows),
+        category_texts='\n'.join(_CATEGORY_TEXTS_TEMPLATE.format_map(row) for row in rows)
+    )
 
 
 def get_rating_from_score(score: float) -> str:
     """Convert numeric score to rating label."""
-    if score >= 90:
-        return 'excellent'
-    elif score >= 75:
-        return 'good'
-    elif score >= 60:
-        return 'fair'
-    elif score >= 40:
-        return 'poor'
-    else:
-        return 'critical'
+    return _RATINGS[bisect.bisect_right(_RATING_BOUNDS, score)]
 
 
 # Cloudflare Worker endpoint handler
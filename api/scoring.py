@@ -11,14 +11,22 @@ Calculates a 0-100 score based on weighted checks across 5 categories:
 Each category contains specific checks with point values.
 """
 
+import os
 import json
-from typing import Dict, List, Tuple
+import bisect
+import functools
+from typing import Dict, List, NamedTuple, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CheckResult:
-    """Result of a single reproducibility check."""
+    """Result of a single reproducibility check; immutable and hashable."""
     check_id: str
     passed: bool
     points_earned: int
@@ -27,17 +35,118 @@ class CheckResult:
     message: str
 
 
+class Recommendation(NamedTuple):
+    """Fix suggested for a failed check; serialized with _asdict()."""
+    check_id: str
+    category: str
+    priority: str
+    title: str
+    fix: str
+    example: str
+    points_impact: int
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config(path: str, mtime: float) -> Dict:
+    """Parse a checks.json file; cached per (path, mtime) so edits are picked up."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def load_checks_config(checks_config_path: str) -> Dict:
+    """
+    Load check definitions, parsing each version of the file only once.
+    
+    The result is shared between every scorer and analyzer using the same
+    file and must not be mutated.
+    """
+    path = os.path.realpath(checks_config_path)
+    return _load_config(path, os.stat(path).st_mtime)
+
+
+# Badge colors and status text by rating
+_BADGE_COLORS = {
+    'excellent': '#44cc11',  # Green
+    'good': '#97ca00',       # Light green
+    'fair': '#dfb317',       # Yellow
+    'poor': '#fe7d37',       # Orange
+    'critical': '#e05d44'    # Red
+}
+
+_BADGE_STATUS = {
+    'excellent': 'Excellent',
+    'good': 'Good',
+    'fair': 'Fair',
+    'poor': 'Needs Work',
+    'critical': 'Critical Issues'
+}
+
+
+def _category_contribution(earned: int, possible: int, weight: int) -> Tuple[float, float]:
+    """Rounded 0-100 category score and its weighted contribution to the total."""
+    if possible > 0:
+        # Normalize to 0-100 and apply weight
+        normalized = (earned / possible) * 100
+        weighted_score = (normalized * weight) / 100
+        return round(normalized, 1), round(weighted_score, 1)
+    return 0, 0
+
+
+def _priority_from_points(points: int) -> str:
+    """Priority for a check without an explicit severity, by its weight."""
+    if points >= 10:
+        return 'critical'
+    elif points >= 7:
+        return 'high'
+    elif points >= 5:
+        return 'medium'
+    else:
+        return 'low'
+
+
 class ReproducibilityScorer:
     """Calculate reproducibility scores and generate recommendations."""
     
+    # Sort order of recommendation priorities; unknown priorities sort last
+    _PRIORITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+    
     def __init__(self, checks_config_path: str = "data/checks.json"):
         """Load check definitions from JSON config."""
-        with open(checks_config_path, 'r') as f:
-            self.config = json.load(f)
+        self.config = load_checks_config(checks_config_path)
         
         self.checks = self.config['checks']
         self.thresholds = self.config['thresholds']
         self.recommendations = self.config['recommendations']
+        
+        # Rating cutoffs in ascending order; a score below the lowest one is
+        # critical, otherwise it takes the label of the highest cutoff reached
+        cutoffs = sorted(self.thresholds.items(), key=lambda kv: kv[1])
+        self._rating_cutoffs = tuple(value for _, value in cutoffs)
+        self._rating_labels = ('critical',) + tuple(label for label, _ in cutoffs)
+        
+        # Check definitions by id, so lookups don't rescan every category
+        self._check_index = {
+            item['id']: item
+            for category_config in self.checks.values()
+            for item in category_config['items']
+        }
+        
+        # checks.json doesn't change after loading, so per-category weights
+        # and maximum points are computed once rather than on every score
+        self._weights = {
+            name: category_config['weight']
+            for name, category_config in self.checks.items()
+        }
+        self._possible_by_category = {
+            name: sum(item['points'] for item in category_config['items'])
+            for name, category_config in self.checks.items()
+        }
+        
+        # Identical result sets (e.g. re-analyzing an unchanged repository)
+        # are scored once. CheckResult is frozen, so a tuple of them is a key;
+        # it keeps their order, which breaks ties between recommendations
+        self._evaluate_cached = functools.lru_cache(maxsize=1024)(self._evaluate)
     
     def calculate_score(self, check_results: List[CheckResult]) -> Dict:
         """
@@ -49,36 +158,83 @@ class ReproducibilityScorer:
         Returns:
             Dict with overall score, category scores, and rating
         """
-        category_scores = {}
+        return self._score_dict(self._evaluate_cached(tuple(check_results)))
+    
+    def generate_recommendations(self, check_results: List[CheckResult]) -> List[Dict]:
+        """
+        Generate actionable recommendations for failed checks.
         
-        for category_name, category_config in self.checks.items():
-            weight = category_config['weight']
+        Args:
+            check_results: List of CheckResult objects
             
+        Returns:
+            List of recommendations sorted by priority
+        """
+        return [r._asdict() for r in self._evaluate_cached(tuple(check_results))[3]]
+    
+    def score_and_recommend(self, check_results: List[CheckResult]) -> Tuple[Dict, List[Dict]]:
+        """
+        Calculate the score and recommendations in one pass over the results.
+        
+        Equivalent to calling calculate_score and generate_recommendations,
+        for callers that need both.
+        
+        Args:
+            check_results: List of CheckResult objects
+            
+        Returns:
+            Tuple of (score data, recommendations sorted by priority)
+        """
+        evaluated = self._evaluate_cached(tuple(check_results))
+        return self._score_dict(evaluated), [r._asdict() for r in evaluated[3]]
+    
+    def _evaluate(self, check_results: Tuple[CheckResult, ...]) -> tuple:
+        """
+        Score and rank a set of results in a single pass.
+        
+        Returns (overall_score, rating, category rows, recommendations), all
+        immutable so memoized entries can be shared; the public methods build
+        fresh dicts from them on every call.
+        """
+        # Points earned per category; results for unknown categories are ignored
+        earned_by_category = dict.fromkeys(self.checks, 0)
+        failed = []
+        for r in check_results:
+            if r.category in earned_by_category:
+                earned_by_category[r.category] += r.points_earned
+            if not r.passed:
+                failed.append(r)
+        
+        rows = []
+        for category_name, weight in self._weights.items():
             # Calculate points for this category
-            earned = sum(r.points_earned for r in check_results if r.category == category_name)
-            possible = sum(item['points'] for item in category_config['items'])
+            earned = earned_by_category[category_name]
+            possible = self._possible_by_category[category_name]
             
-            # Normalize to 0-100 and apply weight
-            if possible > 0:
-                normalized = (earned / possible) * 100
-                weighted_score = (normalized * weight) / 100
-            else:
-                weighted_score = 0
+            score, contribution = _category_contribution(earned, possible, weight)
             
-            category_scores[category_name] = {
-                'score': round(normalized, 1) if possible > 0 else 0,
+            rows.append((category_name, score, weight, contribution, earned, possible))
+        
+        # Overall score is sum of weighted contributions
+        overall_score = round(sum(row[3] for row in rows), 1)
+        
+        return overall_score, self._get_rating(overall_score), tuple(rows), self._recommend(failed)
+    
+    @staticmethod
+    def _score_dict(evaluated: tuple) -> Dict:
+        """Build the score breakdown returned by calculate_score."""
+        overall_score, rating, rows, _ = evaluated
+        
+        category_scores = {
+            category_name: {
+                'score': score,
                 'weight': weight,
-                'weighted_contribution': round(weighted_score, 1),
+                'weighted_contribution': contribution,
                 'points_earned': earned,
                 'points_possible': possible
             }
-        
-        # Overall score is sum of weighted contributions
-        overall_score = sum(cat['weighted_contribution'] for cat in category_scores.values())
-        overall_score = round(overall_score, 1)
-        
-        # Determine rating
-        rating = self._get_rating(overall_score)
+            for category_name, score, weight, contribution, earned, possible in rows
+        }
         
         return {
             'overall_score': overall_score,
@@ -87,74 +243,43 @@ class ReproducibilityScorer:
             'max_possible_score': 100
         }
     
-    def _get_rating(self, score: float) -> str:
-        """Convert numeric score to rating label."""
-        if score >= self.thresholds['excellent']:
-            return 'excellent'
-        elif score >= self.thresholds['good']:
-            return 'good'
-        elif score >= self.thresholds['fair']:
-            return 'fair'
-        elif score >= self.thresholds['poor']:
-            return 'poor'
-        else:
-            return 'critical'
-    
-    def generate_recommendations(self, check_results: List[CheckResult]) -> List[Dict]:
-        """
-        Generate actionable recommendations for failed checks.
-        
-        Args:
-            check_results: List of CheckResult objects
-            
-        Returns:
-            List of recommendations sorted by priority
-        """
+    def _recommend(self, failed_results: List[CheckResult]) -> Tuple[Recommendation, ...]:
+        """Build recommendations for failed checks, most urgent first."""
         recommendations = []
         
-        for result in check_results:
-            if not result.passed:
-                rec_config = self.recommendations.get(result.check_id, {})
-                
-                recommendations.append({
-                    'check_id': result.check_id,
-                    'category': result.category,
-                    'priority': self._get_priority(result),
-                    'title': result.message,
-                    'fix': rec_config.get('fix', 'No specific recommendation available'),
-                    'example': rec_config.get('example', ''),
-                    'points_impact': result.points_possible
-                })
+        for result in failed_results:
+            rec_config = self.recommendations.get(result.check_id, {})
+            
+            recommendations.append(Recommendation(
+                result.check_id,
+                result.category,
+                self._get_priority(result),
+                result.message,
+                rec_config.get('fix', 'No specific recommendation available'),
+                rec_config.get('example', ''),
+                result.points_possible
+            ))
         
         # Sort by priority (critical first) then by points impact
-        priority_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+        priority_order = self._PRIORITY_ORDER
         recommendations.sort(
-            key=lambda x: (priority_order.get(x['priority'], 99), -x['points_impact'])
+            key=lambda r: (priority_order.get(r.priority, 99), -r.points_impact)
         )
         
-        return recommendations
+        return tuple(recommendations)
+    
+    def _get_rating(self, score: float) -> str:
+        """Convert numeric score to rating label."""
+        return self._rating_labels[bisect.bisect_right(self._rating_cutoffs, score)]
     
     def _get_priority(self, result: CheckResult) -> str:
         """Determine priority level for a failed check."""
-        # Find the check config
-        for category_config in self.checks.values():
-            for item in category_config['items']:
-                if item['id'] == result.check_id:
-                    # Explicit severity if defined
-                    if 'severity' in item:
-                        return item['severity']
-                    
-                    # Otherwise base on points
-                    if result.points_possible >= 10:
-                        return 'critical'
-                    elif result.points_possible >= 7:
-                        return 'high'
-                    elif result.points_possible >= 5:
-                        return 'medium'
-                    else:
-                        return 'low'
+        item = self._check_index.get(result.check_id)
+        if item is None:
+            return 'medium'
         
-        return 'medium'
+        # Explicit severity if defined, otherwise based on points
+        return item.get('severity') or _priority_from_points(result.points_possible)
     
     def format_badge_data(self, score: float) -> Dict:
         """
@@ -168,31 +293,32 @@ class ReproducibilityScorer:
         """
         rating = self._get_rating(score)
         
-        color_map = {
-            'excellent': '#44cc11',  # Green
-            'good': '#97ca00',       # Light green
-            'fair': '#dfb317',       # Yellow
-            'poor': '#fe7d37',       # Orange
-            'critical': '#e05d44'    # Red
-        }
-        
-        label_map = {
-            'excellent': 'Excellent',
-            'good': 'Good',
-            'fair': 'Fair',
-            'poor': 'Needs Work',
-            'critical': 'Critical Issues'
-        }
-        
         return {
             'label': 'reproducibility',
             'message': f"{score:.0f}/100",
-            'status': label_map[rating],
-            'color': color_map[rating],
+            'status': _BADGE_STATUS[rating],
+            'color': _BADGE_COLORS[rating],
             'score': score
         }
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_scorer(path: str, mtime: float) -> ReproducibilityScorer:
+    """Build a scorer for one version of a checks.json file."""
+    return ReproducibilityScorer(path)
+
+
+def get_scorer(checks_config_path: str = "data/checks.json") -> ReproducibilityScorer:
+    """
+    Shared scorer for a config file, rebuilt when the file changes.
+    
+    For long-running callers such as the server, so that edits to the
+    config reach scoring and analysis together.
+    """
+    path = os.path.realpath(checks_config_path)
+    return _cached_scorer(path, os.stat(path).st_mtime)
+
+
 def example_usage():
     """Example of how to use the scorer."""
     
@@ -5,20 +5,65 @@ Can be deployed as standalone service or triggered by Cloudflare Workers.
 
 import json
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import gzip
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from analyze import analyze_repo_from_url
+from scoring import get_scorer
+
+# Upper bound on repositories analyzed concurrently within one batch
+_MAX_BATCH_WORKERS = 32
+
+# Largest batch accepted by /analyze_batch; each item is a full clone
+_MAX_BATCH_SIZE = 50
+
+# Resolved from this file so the server can start from any directory
+_CHECKS_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'checks.json')
+
+
+def _loads(body):
+    """Parse a JSON request body."""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _dumps(obj, pretty=False):
+    """Serialize a JSON response body straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+
+def _analyze_one(repo_url, scorer):
+    """Analyze a single batch item, reporting failures inline."""
+    try:
+        return analyze_repo_from_url(repo_url, _CHECKS_CONFIG, scorer=scorer)
+    except Exception as e:
+        return {'repo_url': repo_url, 'error': str(e)}
 
 
 class AnalysisHandler(BaseHTTPRequestHandler):
     """HTTP request handler for analysis endpoints."""
     
+    # Persistent connections; every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    
     def do_POST(self):
-        """Handle POST /analyze requests."""
-        if self.path != '/analyze':
+        """Handle POST /analyze and /analyze_batch requests."""
+        path = urlparse(self.path).path
+        if path == '/analyze_batch':
+            self._handle_batch()
+            return
+        if path != '/analyze':
             self.send_error(404)
             return
         
@@ -27,58 +72,115 @@ class AnalysisHandler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
         
         try:
-            data = json.loads(body)
+            data = _loads(body)
             repo_url = data.get('repo_url')
             
-            if not repo_url:
+            if not repo_url or not isinstance(repo_url, str):
                 self.send_error(400, 'Missing repo_url')
                 return
             
-            # Run analysis
-            result = analyze_repo_from_url(repo_url)
+            # Run analysis; the scorer is shared until checks.json changes
+            result = analyze_repo_from_url(repo_url, _CHECKS_CONFIG, scorer=get_scorer(_CHECKS_CONFIG))
             
             # Send response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            self._send_json(result, cors=True)
             
-            self.wfile.write(json.dumps(result, indent=2).encode())
+        except Exception as e:
+            self.send_error(500, str(e))
+    
+    def _handle_batch(self):
+        """
+        Analyze several repositories in one request.
+        
+        Expects {"repo_urls": [...]} holding at most _MAX_BATCH_SIZE URL
+        strings, and responds with a JSON array in the same order. Clones
+        and scans are I/O-bound, so the repositories are analyzed
+        concurrently; a failing repository yields an item with an 'error'
+        key instead of failing the whole batch.
+        """
+        content_length = int(self.headers['Content-Length'])
+        body = self.rfile.read(content_length)
+        
+        try:
+            data = _loads(body)
+            repo_urls = data.get('repo_urls')
+            
+            if not repo_urls or not isinstance(repo_urls, list):
+                self.send_error(400, 'Missing repo_urls')
+                return
+            if len(repo_urls) > _MAX_BATCH_SIZE:
+                self.send_error(400, f'At most {_MAX_BATCH_SIZE} repo_urls per batch')
+                return
+            if not all(isinstance(url, str) and url for url in repo_urls):
+                self.send_error(400, 'repo_urls must be non-empty strings')
+                return
+            
+            # One scorer for the whole batch, so every item uses the same config
+            analyze_one = partial(_analyze_one, scorer=get_scorer(_CHECKS_CONFIG))
+            workers = min(_MAX_BATCH_WORKERS, len(repo_urls))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(analyze_one, repo_urls))
+            
+            self._send_json(results, cors=True)
             
         except Exception as e:
             self.send_error(500, str(e))
     
     def do_GET(self):
         """Handle GET /health requests."""
-        if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            
-            self.wfile.write(json.dumps({
+        if urlparse(self.path).path == '/health':
+            self._send_json({
                 'status': 'healthy',
                 'service': 'reproducibility-validator-analysis'
-            }).encode())
+            })
         else:
             self.send_error(404)
     
+    def _send_json(self, obj, cors=False):
+        """
+        Write a 200 JSON response with an exact Content-Length.
+        
+        Output is compact unless the request asks for ?pretty=1, and is
+        gzipped (at the fastest level) when the client accepts it.
+        """
+        query = parse_qs(urlparse(self.path).query)
+        payload = _dumps(obj, pretty=query.get('pretty') == ['1'])
+        compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compress:
+            payload = gzip.compress(payload, compresslevel=1)
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(payload)))
+        if cors:
+            self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        self.wfile.write(payload)
+    
     def do_OPTIONS(self):
         """Handle CORS preflight."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
 
 def run_server(port=8080):
     """Start the analysis server."""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, AnalysisHandler)
+    # One thread per request, so a slow clone doesn't block other clients
+    httpd = ThreadingHTTPServer(server_address, AnalysisHandler)
     
     print(f'Starting analysis server on port {port}...')
     print(f'Health check: http://localhost:{port}/health')
     print(f'Analysis endpoint: POST http://localhost:{port}/analyze')
+    print(f'Batch endpoint: POST http://localhost:{port}/analyze_batch')
     
     httpd.serve_forever()
 
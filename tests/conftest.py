@@ -0,0 +1,18 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from scoring import ReproducibilityScorer
+
+
+@pytest.fixture(scope="session")
+def scorer():
+    """Scorer loaded once from data/checks.json and shared by every test."""
+    return ReproducibilityScorer('data/checks.json')
@@ -7,11 +7,15 @@ import sys
 import os
 import tempfile
 import shutil
+import subprocess
 from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
 
-from analyze import RepositoryAnalyzer
+import pytest
+
+import analyze
+from analyze import RepositoryAnalyzer, _scan_conda_dependencies
 
 
 def create_test_repo(tmpdir, files_to_create):
@@ -20,7 +24,7 @@ def create_test_repo(tmpdir, files_to_create):
     repo_path.mkdir()
     
     # Initialize git repo
-    os.system(f'cd {repo_path} && git init')
+    subprocess.run(['git', '-C', str(repo_path), 'init', '-q'], check=True)
     
     # Create files
     for filename, content in files_to_create.items():
@@ -28,13 +32,18 @@ def create_test_repo(tmpdir, files_to_create):
         file_path.parent.mkdir(parents=True, exist_ok=True)
         file_path.write_text(content)
     
-    # Commit files
-    os.system(f'cd {repo_path} && git add . && git commit -m "Initial commit"')
+    # Commit files, with an explicit identity so it works without git config
+    subprocess.run(['git', '-C', str(repo_path), 'add', '-A'], check=True)
+    subprocess.run(
+        ['git', '-C', str(repo_path), '-c', 'user.name=Test', '-c', 'user.email=test@example.com',
+         'commit', '-q', '-m', 'Initial commit'],
+        check=True
+    )
     
     return str(repo_path)
 
 
-def test_environment_detection():
+def test_environment_detection(scorer):
     """Test detection of environment files."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -43,7 +52,7 @@ def test_environment_detection():
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_environment(repo_path)
         
@@ -52,7 +61,15 @@ def test_environment_detection():
         assert any(r.check_id == 'env_file_exists' and r.passed for r in results)
 
 
-def test_dependency_pinning():
+def test_analyzer_uses_scorer_config(scorer):
+    """Test a passed-in scorer's checks are the ones the analyzer runs."""
+    analyzer = RepositoryAnalyzer('does/not/exist.json', scorer=scorer)
+    
+    assert analyzer.config is scorer.config
+    assert analyzer.checks is scorer.checks
+
+
+def test_dependency_pinning(scorer):
     """Test dependency pinning detection."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -60,7 +77,7 @@ def test_dependency_pinning():
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_environment(repo_path)
         
@@ -69,7 +86,7 @@ def test_dependency_pinning():
         assert findings['total_dependencies'] == 3
 
 
-def test_unpinned_dependencies():
+def test_unpinned_dependencies(scorer):
     """Test detection of unpinned dependencies."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -77,7 +94,7 @@ def test_unpinned_dependencies():
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_environment(repo_path)
         
@@ -86,7 +103,154 @@ def test_unpinned_dependencies():
         assert findings['total_dependencies'] == 3
 
 
-def test_seed_detection():
+def test_requirements_with_bom(scorer):
+    """Test the first requirement is counted when the file starts with a BOM."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = create_test_repo(tmpdir, {'requirements.txt': ''})
+        Path(repo_path, 'requirements.txt').write_bytes(b'\xef\xbb\xbfnumpy==1.0\npandas==2.0\n')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_environment(repo_path)
+        
+        assert findings['pinned_dependencies'] == 2
+        assert findings['total_dependencies'] == 2
+
+
+def test_pyproject_pep621_pinning(scorer):
+    """Test pinning detection in PEP 621 project dependencies."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {
+            'pyproject.toml': '''
+[project]
+name = "example"
+dependencies = ["numpy==1.24.3", "pandas>=2.0"]
+
+[project.optional-dependencies]
+dev = ["pytest==7.4.0"]
+''',
+        }
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_environment(repo_path)
+        
+        assert findings['pinned_dependencies'] == 2
+        assert findings['total_dependencies'] == 3
+
+
+def test_pyproject_poetry_pinning(scorer):
+    """Test pinning detection in Poetry dependency tables."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {
+            'pyproject.toml': '''
+[tool.poetry.dependencies]
+python = "^3.10"
+numpy = "1.24.3"
+pandas = "^2.0"
+torch = { version = "2.1.0", optional = true }
+
+[tool.poetry.dev-dependencies]
+pytest = "*"
+
+[tool.poetry.group.test.dependencies]
+coverage = "7.3.2"
+hypothesis = ">=6.0"
+
+[tool.poetry.group.docs]
+optional = true
+''',
+        }
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_environment(repo_path)
+        
+        assert findings['pinned_dependencies'] == 3
+        assert findings['total_dependencies'] == 6
+
+
+def test_malformed_pyproject(scorer):
+    """Test malformed pyproject.toml files are skipped, not fatal."""
+    malformed = [
+        'optional-dependencies = ["a"]\n[project]\noptional-dependencies = ["a"]\n',
+        '[tool]\npoetry = "x"\n',
+        '[project]\ndependencies = "numpy"\n[tool.poetry]\ndependencies = []\n',
+        '[project\n',
+    ]
+    analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+    
+    for content in malformed:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo_path = create_test_repo(tmpdir, {'pyproject.toml': content})
+            
+            results, findings = analyzer._check_environment(repo_path)
+            
+            assert findings['total_dependencies'] == 0
+    
+    # Not valid UTF-8
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = create_test_repo(tmpdir, {'README.md': '# Test\n'})
+        Path(repo_path, 'pyproject.toml').write_bytes(b'[project]\nname = "\xff\xfe"\n')
+        
+        results, findings = analyzer._check_environment(repo_path)
+        
+        assert findings['total_dependencies'] == 0
+
+
+CONDA_ENVIRONMENTS = {
+    'block': '''
+name: example
+channels:
+  - conda-forge
+dependencies:
+  - python=3.10
+  - numpy=1.24.3  # pinned
+  - pandas
+''',
+    'nested_pip': '''
+dependencies:
+  - python=3.10
+  - pip
+  - pip:
+      - requests==2.31.0
+      - flask
+  - scipy>=1.10
+''',
+    'flow': 'dependencies: [numpy=1.24.3, pandas]\n',
+    'empty_item': 'dependencies:\n  - \n  - numpy\n',
+    'comment_item': 'dependencies:\n  - # note\n  - numpy\n',
+    'continued_item': 'dependencies:\n  -\n    numpy\n',
+    'quoted': 'dependencies:\n  - "numpy=1.24.3"\n',
+    'inline_mapping': 'dependencies:\n  - numpy\n  - pip: [requests==2.31]\n',
+    'mapping_item': 'dependencies:\n  - name: x\n  - numpy\n',
+    'typed_scalars': 'dependencies:\n  - 1.5\n  - true\n  - null\n  - numpy\n',
+    'nested_list': 'dependencies:\n  - - x\n  - numpy\n',
+    'continued_value': 'dependencies:\n  - numpy\n    =1.24.3\n',
+    'no_dependencies': 'name: example\n',
+}
+
+
+@pytest.mark.parametrize('name', sorted(CONDA_ENVIRONMENTS))
+def test_conda_scanner_matches_yaml(name):
+    """Test the environment.yml scanner agrees with a full YAML parse."""
+    yaml = pytest.importorskip('yaml')
+    content = CONDA_ENVIRONMENTS[name]
+    
+    expected = [
+        dep for dep in (yaml.safe_load(content) or {}).get('dependencies') or []
+        if isinstance(dep, str)
+    ]
+    scanned = _scan_conda_dependencies(content)
+    
+    # None means "not handled here, parse with PyYAML"
+    assert scanned is None or scanned == expected
+    if name in ('block', 'nested_pip', 'no_dependencies'):
+        assert scanned == expected
+
+
+def test_seed_detection(scorer):
     """Test random seed detection in code."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -103,7 +267,7 @@ np.random.seed(42)
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_randomness(repo_path)
         
@@ -112,7 +276,88 @@ np.random.seed(42)
         assert any(r.check_id == 'seed_detection' and r.passed for r in results)
 
 
-def test_documentation_checks():
+def test_scan_without_reader_threads(scorer, monkeypatch):
+    """Test files are read serially when no prefetch thread can start."""
+    def no_threads():
+        raise RuntimeError("can't start new thread")
+    monkeypatch.setattr(analyze, '_get_prefetch_executor', no_threads)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {f'src/module_{i}.py': 'import random\n' for i in range(20)}
+        files['src/main.py'] = 'import random\nrandom.seed(42)\n'
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_randomness(repo_path)
+        
+        assert any(m['file'] == 'src/main.py' for m in findings['seed_matches'])
+
+
+@pytest.mark.parametrize('use_git', [True, False])
+def test_excluded_directories_are_skipped(scorer, use_git):
+    """Test build output and virtualenvs are pruned from the file index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        seeded = 'import random\nrandom.seed(42)\n'
+        files = {
+            'src/train.py': seeded,
+            'build/lib/train.py': seeded,
+            'dist/train.py': seeded,
+            '.venv/lib/module.py': seeded,
+            'lib/site-packages/module.py': seeded,
+        }
+        
+        repo_path = create_test_repo(tmpdir, files)
+        if not use_git:
+            # Indexed with os.walk instead of git ls-files
+            shutil.rmtree(Path(repo_path) / '.git')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_randomness(repo_path)
+        
+        assert {m['file'] for m in findings['seed_matches']} == {'src/train.py'}
+
+
+@pytest.mark.parametrize('padding', [0, 20])
+def test_scan_skips_empty_binary_and_oversized_files(padding):
+    """Test the scan skip rules, with and without the read-ahead pool."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        seeded = 'random.seed(42)\n'
+        files = {
+            'seeded.py': seeded,
+            'empty.py': '',
+            'model.pkl': seeded,
+            'huge.py': seeded + 'x = 1\n' * (analyze._MAX_SCAN_BYTES // 6),
+        }
+        # Enough small files to go through _prefetch_files
+        files.update({f'pad_{i}.py': 'x = 1\n' for i in range(padding)})
+        
+        repo_path = create_test_repo(tmpdir, files)
+        patterns = [r'random\.seed\(']
+        matches = analyze._scan_files(
+            str(repo_path), sorted(files), analyze._compile_alternation(tuple(patterns)), patterns
+        )
+        
+        assert [m['file'] for m in matches] == ['seeded.py']
+
+
+def test_large_file_matched_with_line_number(scorer):
+    """Test a memory-mapped file reports the right line for a match."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filler = '# ' + 'x' * 60 + '\n'
+        lines = 300 * 1024 // len(filler)
+        files = {'train.py': 'import random\n' + filler * lines + 'random.seed(7)\n'}
+        
+        repo_path = create_test_repo(tmpdir, files)
+        assert os.path.getsize(Path(repo_path) / 'train.py') >= analyze._MMAP_MIN_BYTES
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_randomness(repo_path)
+        
+        assert [(m['file'], m['line']) for m in findings['seed_matches']] == [('train.py', lines + 2)]
+
+
+def test_documentation_checks(scorer):
     """Test documentation quality checks."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -130,7 +375,7 @@ Expected output: Accuracy of 0.95
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_documentation(repo_path)
         
@@ -139,7 +384,7 @@ Expected output: Accuracy of 0.95
         assert len(passed_checks) >= 3  # README, installation, usage, expected output
 
 
-def test_testing_detection():
+def test_testing_detection(scorer):
     """Test detection of test files and CI."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -161,7 +406,7 @@ jobs:
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         results, findings = analyzer._check_testing(repo_path)
         
@@ -170,7 +415,147 @@ jobs:
         assert len(findings['ci_files']) > 0
 
 
-def test_full_analysis():
+def test_patterns_with_group_references(scorer):
+    """Test patterns that can't share one alternation are still matched."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {
+            'main.py': 'value = 1\nx = xx\nrandom.seed(0)\n',
+        }
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        # A numbered backreference and a group named like the wrapper groups
+        matches = analyzer._search_code_patterns(
+            repo_path, [r'(x) = \1', r'(?P<g0>random)\.seed'], ['*.py']
+        )
+        
+        assert [(m['pattern'], m['line']) for m in matches] == [
+            (r'(x) = \1', 2), (r'(?P<g0>random)\.seed', 3)
+        ]
+
+
+def test_small_scan_stays_in_process(scorer):
+    """Test a small repository is scanned without starting worker processes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {f'module_{i}.py': 'random.seed(42)\n' for i in range(300)}
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_randomness(repo_path)
+        
+        assert len(findings['seed_matches']) == 300
+        assert analyzer._scan_pool is None
+
+
+def test_directory_ignored_by_enclosing_repo(scorer):
+    """Test a directory ignored by an enclosing git repo is still indexed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {
+            '.gitignore': 'vendor/\n',
+            'vendor/proj/README.md': '# Vendored Project\n',
+            'vendor/proj/requirements.txt': 'numpy==1.24.3\n',
+        }
+        
+        repo_path = create_test_repo(tmpdir, files)
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_environment(os.path.join(repo_path, 'vendor', 'proj'))
+        
+        assert 'requirements.txt' in findings['found_env_files']
+
+
+def git(repo_path, *args):
+    """Run a git command in repo_path and return its stripped output."""
+    result = subprocess.run(
+        ['git', '-C', str(repo_path), '-c', 'user.name=Test', '-c', 'user.email=test@example.com',
+         *args],
+        check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+def git_file_reader(scorer):
+    """Analyzer whose git metadata must come from .git, not the git CLI."""
+    def no_cli(repo_path):
+        raise AssertionError('fell back to the git CLI')
+    
+    analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+    analyzer._get_commit_hash = analyzer._get_repo_url = no_cli
+    return analyzer
+
+
+def test_submodule_counts_as_directory(scorer):
+    """Test a submodule is indexed as a directory even when left empty."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_repo = create_test_repo(tmpdir, {'sample.csv': 'a,b\n1,2\n'})
+        main_dir = os.path.join(tmpdir, 'main')
+        os.mkdir(main_dir)
+        repo_path = create_test_repo(main_dir, {'README.md': '# Test\n'})
+        git(repo_path, '-c', 'protocol.file.allow=always', 'submodule', 'add', '-q', data_repo, 'data')
+        git(repo_path, 'commit', '-q', '-m', 'Add data submodule')
+        
+        # A shallow clone leaves submodule directories empty
+        git(repo_path, 'submodule', 'deinit', '-q', '-f', 'data')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
+        
+        results, findings = analyzer._check_data_availability(repo_path)
+        
+        assert findings['data_directories'] == ['data']
+        assert any(r.check_id == 'sample_data' and r.passed for r in results)
+
+
+def test_git_meta_loose_and_packed_refs(scorer):
+    """Test commit and origin are read from .git like the git CLI reports them."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = create_test_repo(tmpdir, {'README.md': '# Test\n'})
+        analyzer = git_file_reader(scorer)
+        
+        # No origin remote
+        assert analyzer._read_git_meta(repo_path) == (git(repo_path, 'rev-parse', 'HEAD'), '')
+        
+        # Loose ref for the current branch
+        git(repo_path, 'remote', 'add', 'origin', 'https://example.com/test/repo.git')
+        expected = (git(repo_path, 'rev-parse', 'HEAD'), 'https://example.com/test/repo.git')
+        assert analyzer._read_git_meta(repo_path) == expected
+        
+        # Same ref moved into packed-refs
+        git(repo_path, 'pack-refs', '--all')
+        assert not list(Path(repo_path, '.git', 'refs', 'heads').iterdir())
+        assert analyzer._read_git_meta(repo_path) == expected
+
+
+def test_git_meta_detached_head(scorer):
+    """Test a detached HEAD resolves to the checked-out commit."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = create_test_repo(tmpdir, {'README.md': '# Test\n'})
+        first = git(repo_path, 'rev-parse', 'HEAD')
+        git(repo_path, 'commit', '-q', '--allow-empty', '-m', 'Second commit')
+        git(repo_path, 'checkout', '-q', '--detach', first)
+        analyzer = git_file_reader(scorer)
+        
+        assert analyzer._read_git_meta(repo_path)[0] == first
+
+
+def test_git_meta_worktree(scorer):
+    """Test a linked worktree follows its gitdir pointer and commondir."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = create_test_repo(tmpdir, {'README.md': '# Test\n'})
+        git(repo_path, 'remote', 'add', 'origin', 'https://example.com/test/repo.git')
+        git(repo_path, 'commit', '-q', '--allow-empty', '-m', 'Second commit')
+        worktree = os.path.join(tmpdir, 'worktree')
+        git(repo_path, 'worktree', 'add', '-q', '-b', 'feature', worktree, 'HEAD~1')
+        analyzer = git_file_reader(scorer)
+        
+        assert Path(worktree, '.git').is_file()
+        assert analyzer._read_git_meta(worktree) == (
+            git(worktree, 'rev-parse', 'HEAD'), 'https://example.com/test/repo.git'
+        )
+        assert analyzer._read_git_meta(worktree)[0] != git(repo_path, 'rev-parse', 'HEAD')
+
+
+def test_full_analysis(scorer):
     """Test full repository analysis pipeline."""
     with tempfile.TemporaryDirectory() as tmpdir:
         files = {
@@ -193,7 +578,7 @@ print("Hello")
         }
         
         repo_path = create_test_repo(tmpdir, files)
-        analyzer = RepositoryAnalyzer('data/checks.json')
+        analyzer = RepositoryAnalyzer('data/checks.json', scorer=scorer)
         
         result = analyzer.analyze_repository(repo_path)
         
@@ -5,12 +5,14 @@ Run with: pytest tests/
 
 import sys
 import os
+import json
+import shutil
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
 
-from scoring import CheckResult, ReproducibilityScorer
+from scoring import CheckResult, get_scorer
 
 
-def test_perfect_score():
+def test_perfect_score(scorer):
     """Test repository with all checks passing."""
     results = [
         CheckResult('env_file_exists', True, 10, 10, 'environment', 'Environment file exists'),
@@ -31,14 +33,13 @@ def test_perfect_score():
         CheckResult('test_coverage', True, 2, 2, 'testing', 'Test coverage'),
     ]
     
-    scorer = ReproducibilityScorer('data/checks.json')
     score_data = scorer.calculate_score(results)
     
     assert score_data['overall_score'] == 100.0
     assert score_data['rating'] == 'excellent'
 
 
-def test_no_checks_passing():
+def test_no_checks_passing(scorer):
     """Test repository with no checks passing."""
     results = [
         CheckResult('env_file_exists', False, 0, 10, 'environment', 'Environment file exists'),
@@ -46,14 +47,13 @@ def test_no_checks_passing():
         CheckResult('readme_exists', False, 0, 5, 'documentation', 'README exists'),
     ]
     
-    scorer = ReproducibilityScorer('data/checks.json')
     score_data = scorer.calculate_score(results)
     
     assert score_data['overall_score'] == 0.0
     assert score_data['rating'] == 'critical'
 
 
-def test_partial_score():
+def test_partial_score(scorer):
     """Test repository with some checks passing."""
     results = [
         CheckResult('env_file_exists', True, 10, 10, 'environment', 'Environment file exists'),
@@ -64,14 +64,13 @@ def test_partial_score():
         CheckResult('tests_exist', False, 0, 8, 'testing', 'Tests exist'),
     ]
     
-    scorer = ReproducibilityScorer('data/checks.json')
     score_data = scorer.calculate_score(results)
     
     # Should be somewhere in the middle
     assert 40 < score_data['overall_score'] < 80
 
 
-def test_recommendations_generation():
+def test_recommendations_generation(scorer):
     """Test recommendation generation for failed checks."""
     results = [
         CheckResult('env_file_exists', False, 0, 10, 'environment', 'Environment file exists'),
@@ -79,7 +78,6 @@ def test_recommendations_generation():
         CheckResult('seed_detection', False, 0, 10, 'randomness', 'Random seed set'),
     ]
     
-    scorer = ReproducibilityScorer('data/checks.json')
     recommendations = scorer.generate_recommendations(results)
     
     assert len(recommendations) == 3
@@ -87,10 +85,39 @@ def test_recommendations_generation():
     assert recommendations[0]['priority'] in ['critical', 'high', 'medium', 'low']
 
 
-def test_badge_data_generation():
-    """Test badge data formatting."""
-    scorer = ReproducibilityScorer('data/checks.json')
+def test_score_and_recommend(scorer):
+    """Test the fused pass matches scoring and recommending separately."""
+    results = [
+        CheckResult('env_file_exists', True, 10, 10, 'environment', 'Environment file exists'),
+        CheckResult('dependencies_pinned', False, 0, 10, 'environment', 'Dependencies pinned'),
+        CheckResult('seed_detection', False, 0, 10, 'randomness', 'Random seed set'),
+        CheckResult('readme_exists', True, 5, 5, 'documentation', 'README exists'),
+    ]
+    
+    score_data, recommendations = scorer.score_and_recommend(results)
     
+    assert score_data == scorer.calculate_score(results)
+    assert recommendations == scorer.generate_recommendations(results)
+
+
+def test_cached_results_are_independent(scorer):
+    """Test repeated scoring of the same results returns fresh objects."""
+    results = [
+        CheckResult('env_file_exists', False, 0, 10, 'environment', 'Environment file exists'),
+        CheckResult('readme_exists', True, 5, 5, 'documentation', 'README exists'),
+    ]
+    
+    first_score, first_recs = scorer.score_and_recommend(results)
+    first_score['category_scores']['environment']['score'] = 999
+    first_recs[0]['fix'] = 'changed'
+    
+    second_score, second_recs = scorer.score_and_recommend(results)
+    assert second_score['category_scores']['environment']['score'] == 0.0
+    assert second_recs[0]['fix'] != 'changed'
+
+
+def test_badge_data_generation(scorer):
+    """Test badge data formatting."""
     # Excellent score
     badge_excellent = scorer.format_badge_data(95.0)
     assert badge_excellent['color'] == '#44cc11'
@@ -117,13 +144,29 @@ def test_badge_data_generation():
     assert badge_critical['status'] == 'Critical Issues'
 
 
-def test_category_weights_sum_to_100():
+def test_category_weights_sum_to_100(scorer):
     """Ensure category weights add up to 100%."""
-    scorer = ReproducibilityScorer('data/checks.json')
     total_weight = sum(cat['weight'] for cat in scorer.checks.values())
     assert total_weight == 100
 
 
+def test_shared_scorer_reloads_edited_config(tmp_path):
+    """Test the shared scorer is reused until checks.json changes."""
+    config_path = tmp_path / 'checks.json'
+    shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'data', 'checks.json'), config_path)
+    scorer = get_scorer(str(config_path))
+    assert get_scorer(str(config_path)) is scorer
+    
+    config = json.loads(config_path.read_text())
+    config['thresholds']['excellent'] = 95
+    config_path.write_text(json.dumps(config))
+    os.utime(config_path, (0, os.stat(config_path).st_mtime + 10))
+    
+    reloaded = get_scorer(str(config_path))
+    assert reloaded is not scorer
+    assert reloaded.thresholds['excellent'] == 95
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__, '-v'])
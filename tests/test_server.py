@@ -0,0 +1,136 @@
+"""
+Unit tests for the analysis HTTP server.
+Run with: pytest tests/
+"""
+
+import sys
+import os
+import gzip
+import http.client
+import json
+import subprocess
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import server
+
+
+def fake_analyze(repo_url, checks_config, scorer=None):
+    """Stand-in for analyze_repo_from_url that never clones."""
+    if 'broken' in repo_url:
+        raise RuntimeError(f'clone failed: {repo_url}')
+    return {'repo_url': repo_url, 'score': 50.0}
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    """URL of a server running on a free port with analysis stubbed out."""
+    monkeypatch.setattr(server, 'analyze_repo_from_url', fake_analyze)
+    httpd = server.ThreadingHTTPServer(('127.0.0.1', 0), server.AnalysisHandler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(url, payload):
+    """POST payload as JSON; return (status, parsed body or None)."""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method='POST')
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def test_batch_preserves_order_and_reports_errors_inline(base_url):
+    """Test batch results come back in request order, failures included."""
+    urls = [f'https://example.com/repo{i}' for i in range(5)]
+    urls.insert(2, 'https://example.com/broken')
+    
+    status, results = post(f'{base_url}/analyze_batch', {'repo_urls': urls})
+    
+    assert status == 200
+    assert [r['repo_url'] for r in results] == urls
+    assert results[2]['error'] == 'clone failed: https://example.com/broken'
+    assert all('error' not in r for i, r in enumerate(results) if i != 2)
+
+
+def test_batch_rejects_oversized_batches(base_url):
+    """Test batches above the size limit are refused before any clone."""
+    urls = [f'https://example.com/repo{i}' for i in range(server._MAX_BATCH_SIZE + 1)]
+    
+    status, _ = post(f'{base_url}/analyze_batch', {'repo_urls': urls})
+    
+    assert status == 400
+
+
+def test_batch_rejects_non_string_items(base_url):
+    """Test every batch item must be a URL string."""
+    status, _ = post(f'{base_url}/analyze_batch', {'repo_urls': ['https://example.com/a', 42]})
+    
+    assert status == 400
+
+
+def test_gzip_response(base_url):
+    """Test responses are gzipped for clients that accept it."""
+    request = urllib.request.Request(f'{base_url}/health', headers={'Accept-Encoding': 'gzip'})
+    with urllib.request.urlopen(request) as response:
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        body = response.read()
+    
+    assert int(response.headers['Content-Length']) == len(body)
+    assert json.loads(gzip.decompress(body))['status'] == 'healthy'
+
+
+def test_compact_and_pretty_json(base_url):
+    """Test output is compact by default and indented with ?pretty=1."""
+    with urllib.request.urlopen(f'{base_url}/health') as response:
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert 'Content-Encoding' not in response.headers
+        compact = response.read()
+    with urllib.request.urlopen(f'{base_url}/health?pretty=1') as response:
+        pretty = response.read()
+    
+    assert b'\n' not in compact
+    assert b'\n  "status"' in pretty
+    assert json.loads(compact) == json.loads(pretty)
+
+
+def test_requests_share_one_connection(base_url):
+    """Test a keep-alive connection serves a preflight and then a request."""
+    conn = http.client.HTTPConnection(urllib.parse.urlparse(base_url).netloc, timeout=5)
+    try:
+        conn.request('OPTIONS', '/analyze')
+        preflight = conn.getresponse()
+        assert preflight.version == 11
+        assert preflight.headers['Content-Length'] == '0'
+        assert preflight.read() == b''
+        sock = conn.sock
+        
+        conn.request('GET', '/health')
+        response = conn.getresponse()
+        assert json.loads(response.read())['status'] == 'healthy'
+        # Both responses came over the same socket, without reconnecting
+        assert conn.sock is sock
+    finally:
+        conn.close()
+
+
+def test_server_imports_outside_repo_root(tmp_path):
+    """Test the server module doesn't depend on the working directory."""
+    api_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+    result = subprocess.run(
+        [sys.executable, '-c', f'import sys; sys.path.insert(0, {api_dir!r}); import server'],
+        cwd=tmp_path, capture_output=True, text=True
+    )
+    
+    assert result.returncode == 0, result.stderr